@@ -0,0 +1,64 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from waffle_backend.metrics import registry
+
+SEMINAR_VERSION_KEY = 'seminar:{}:version'
+# seminar 하나라도 바뀌면 바뀌는 version (seminar list, user가 포함된 survey response의 ETag)
+SEMINARS_VERSION_KEY = 'seminar:all:version'
+SEMINAR_DATA_KEY = 'seminar:{}:data:{}'
+SEMINAR_FULL_KEY = 'seminar:{}:full:{}'
+
+
+def get_seminar_version(seminar_id):
+    # {'id': ..., 'modified': 마지막 invalidate 시각(모르면 None)}
+    return cache.get_or_set(SEMINAR_VERSION_KEY.format(seminar_id), lambda: {'id': uuid4().hex, 'modified': None}, None)
+
+
+def get_seminars_version():
+    return cache.get_or_set(SEMINARS_VERSION_KEY, lambda: uuid4().hex, None)
+
+
+def _rotate_seminar_version(seminar_id):
+    cache.set_many({
+        SEMINAR_VERSION_KEY.format(seminar_id): {'id': uuid4().hex, 'modified': timezone.now()},
+        SEMINARS_VERSION_KEY: uuid4().hex,
+    }, None)
+
+
+def invalidate_seminar(seminar_id):
+    _rotate_seminar_version(seminar_id)
+    # commit 전에 다른 request가 이전 data를 새 version으로 cache했을 수 있으므로 commit 후 한 번 더
+    transaction.on_commit(lambda: _rotate_seminar_version(seminar_id))
+
+
+def get_cached_seminar(seminar_id, version, load):
+    key = SEMINAR_DATA_KEY.format(seminar_id, version['id'])
+    data = cache.get(key)
+    if data is not None:
+        registry.incr('seminar_cache.hit')
+        return data
+
+    registry.incr('seminar_cache.miss')
+    data = load()
+    cache.set(key, data, settings.SEMINAR_CACHE_TIMEOUT)
+    return data
+
+
+def is_seminar_full(seminar_id):
+    # version이 바뀌면(drop, 정원 변경 등) 이전 표시는 더 이상 보지 않음
+    version = cache.get(SEMINAR_VERSION_KEY.format(seminar_id))
+    full = version is not None and cache.get(SEMINAR_FULL_KEY.format(seminar_id, version['id']), False)
+    if full:
+        registry.incr('seminar_join.full_cache.hit')
+    return full
+
+
+def mark_seminar_full(seminar_id, version):
+    # version은 정원을 확인하기 전에 읽은 것, 그 사이에 drop이 commit되었으면 이미 지난 version에 표시됨
+    registry.incr('seminar_join.full_cache.set')
+    cache.set(SEMINAR_FULL_KEY.format(seminar_id, version['id']), True, settings.SEMINAR_FULL_CACHE_TIMEOUT)
@@ -0,0 +1,72 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from seminar.models import UserSeminar
+from seminar.serializers import SeminarSerializer
+
+# SeminarSerializer와 같은 결과를 .values() row에서 바로 (read 전용)
+SEMINAR_FIELDS = ('id', 'name', 'capacity', 'count', 'time', 'online')
+USER_SEMINAR_FIELDS = (
+    'seminar_id', 'role', 'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    'created_at', 'is_active', 'dropped_at',
+)
+
+_time = SeminarSerializer._declared_fields['time'].to_representation
+_datetime = serializers.DateTimeField().to_representation
+
+
+def seminar_rows(queryset):
+    # created_at, search_rank 등은 cursor pagination의 ordering에 필요
+    return queryset.values(*SEMINAR_FIELDS, 'created_at', *queryset.query.annotations)
+
+
+def user_seminar_rows(seminar_ids):
+    return UserSeminar.objects.filter(seminar_id__in=seminar_ids).order_by('id').values(*USER_SEMINAR_FIELDS)
+
+
+def load_user_seminars(seminars):
+    user_seminars = defaultdict(list)
+    seminar_ids = [seminar['id'] for seminar in seminars]
+    if seminar_ids:
+        for row in user_seminar_rows(seminar_ids):
+            user_seminars[row['seminar_id']].append(row)
+    return user_seminars
+
+
+def _user(row):
+    return {
+        'id': row['user_id'],
+        'username': row['user__username'],
+        'email': row['user__email'],
+        'first_name': row['user__first_name'],
+        'last_name': row['user__last_name'],
+        'joined_at': _datetime(row['created_at']),
+    }
+
+
+def compile_seminars(seminars, user_seminars):
+    data = []
+    for seminar in seminars:
+        instructors = []
+        participants = []
+        for row in user_seminars.get(seminar['id'], ()):
+            if row['role'] == UserSeminar.INSTRUCTOR:
+                instructors.append(_user(row))
+            elif row['role'] == UserSeminar.PARTICIPANT:
+                participant = _user(row)
+                participant['is_active'] = row['is_active']
+                participant['dropped_at'] = _datetime(row['dropped_at'])
+                participants.append(participant)
+
+        data.append({
+            'id': seminar['id'],
+            'name': seminar['name'],
+            'capacity': seminar['capacity'],
+            'count': seminar['count'],
+            'time': _time(seminar['time']),
+            'online': seminar['online'],
+            'instructors': instructors,
+            'participants': participants,
+        })
+    return data
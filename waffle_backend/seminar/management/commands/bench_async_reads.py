@@ -0,0 +1,162 @@
+import asyncio
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from rest_framework.authtoken.models import Token
+
+from seminar.models import Seminar, UserSeminar
+from user.models import ParticipantProfile
+from waffle_backend.metrics import percentile
+
+ENDPOINTS = {
+    'seminar-list': 'seminar/',
+    'seminar-detail': 'seminar/{seminar_id}/',
+    'survey-list': 'survey/',
+    'os-list': 'os/',
+}
+MODES = ('wsgi', 'asgi-sync', 'asgi')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare read throughput of the sync endpoints served through WSGI (one server thread per client) with the '
+        '/api/v1/async/ endpoints served through ASGI, using many slow clients that hold the connection while '
+        'draining the response'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=ENDPOINTS, default='seminar-list')
+        parser.add_argument('--mode', choices=MODES, action='append',
+                            help='Mode to run, repeatable (default: all). asgi-sync serves the sync endpoint via ASGI')
+        parser.add_argument('--requests', type=int, default=500, help='Number of requests per mode')
+        parser.add_argument('--clients', type=int, default=200, help='Number of concurrent clients')
+        parser.add_argument('--wsgi-threads', type=int, default=16,
+                            help='Worker threads of the simulated WSGI server (e.g. gunicorn --threads)')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Seconds a slow client takes to drain each response')
+
+    def handle(self, *args, **options):
+        if options['requests'] <= 0 or options['clients'] <= 0 or options['wsgi_threads'] <= 0:
+            raise CommandError('--requests, --clients and --wsgi-threads should be positive numbers')
+
+        seminar, user, token = self._setup()
+        try:
+            path = ENDPOINTS[options['endpoint']].format(seminar_id=seminar.pk)
+            headers = {'authorization': f'Token {token.key}'}
+            for mode in options['mode'] or MODES:
+                url = f'/api/v1/async/{path}' if mode == 'asgi' else f'/api/v1/{path}'
+                if mode == 'wsgi':
+                    results, elapsed = self._run_wsgi(url, headers, options)
+                else:
+                    results, elapsed = asyncio.run(self._run_asgi(url, headers, options))
+                self._report(mode, url, results, elapsed)
+        finally:
+            seminar.delete()
+            user.delete()
+
+    def _setup(self):
+        prefix = f'bench_{uuid4().hex[:8]}'
+        seminar = Seminar.objects.create(name=prefix, capacity=10, count=1, time='00:00')
+        user = User.objects.create_user(username=prefix)
+        ParticipantProfile.objects.create(user=user)
+        UserSeminar.objects.create(user=user, seminar=seminar, role=UserSeminar.PARTICIPANT)
+        return seminar, user, Token.objects.create(user=user)
+
+    def _run_wsgi(self, url, headers, options):
+        handler = WSGIHandler()
+        delay = options['client_delay']
+
+        def request(_):
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': url,
+                'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.input': BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http',
+                **{f"HTTP_{name.upper().replace('-', '_')}": value for name, value in headers.items()},
+            }
+            statuses = []
+            start = time.perf_counter()
+            body = handler(environ, lambda status, response_headers: statuses.append(status))
+            try:
+                for _ in body:
+                    # 느린 client가 응답을 받는 동안 server thread도 묶여 있음
+                    time.sleep(delay)
+            finally:
+                body.close()
+            return time.perf_counter() - start, int(statuses[0].split()[0])
+
+        def worker(index):
+            try:
+                return request(index)
+            finally:
+                close_old_connections()
+
+        # client 수보다 server thread가 적으면 나머지는 accept queue에서 대기
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(options['wsgi_threads'], options['clients'])) as executor:
+            results = list(executor.map(worker, range(options['requests'])))
+        return results, time.perf_counter() - start
+
+    async def _run_asgi(self, url, headers, options):
+        handler = ASGIHandler()
+        delay = options['client_delay']
+        semaphore = asyncio.Semaphore(options['clients'])
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': url,
+            'query_string': b'',
+            'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 0),
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def request():
+            statuses = []
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif message['type'] == 'http.response.body':
+                    # 느린 client는 coroutine 하나만 붙잡음
+                    await asyncio.sleep(delay)
+
+            async with semaphore:
+                start = time.perf_counter()
+                await handler(dict(scope), receive, send)
+                return time.perf_counter() - start, statuses[0]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(request() for _ in range(options['requests'])))
+        return results, time.perf_counter() - start
+
+    def _report(self, mode, url, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        statuses = Counter(status_code for _, status_code in results)
+        self.stdout.write(
+            f'{mode} {url}: {len(results)} requests in {elapsed:.3f}s ({len(results) / elapsed:.1f} req/s) '
+            f'p50={percentile(latencies, 50) * 1000:.1f}ms '
+            f'p95={percentile(latencies, 95) * 1000:.1f}ms '
+            f'p99={percentile(latencies, 99) * 1000:.1f}ms '
+            f"status {', '.join(f'{code}: {count}' for code, count in sorted(statuses.items()))}"
+        )
@@ -0,0 +1,131 @@
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from seminar.models import Seminar, UserSeminar
+from seminar.views import SeminarViewSet
+from user.models import ParticipantProfile
+from waffle_backend.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark concurrent join/drop on POST/DELETE /api/v1/seminar/{id}/user/ against the configured database '
+        '(e.g. --settings pointing to SQLite or a local MySQL) and check that capacity is never exceeded'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participants', '--users', dest='participants', type=int, default=200,
+                            help='Number of participants trying to join')
+        parser.add_argument('--capacity', type=int, default=50, help='Capacity of the benchmark seminar')
+        parser.add_argument('--workers', type=int, default=16, help='Number of concurrent worker threads')
+        parser.add_argument('--drop-ratio', type=float, default=0.2,
+                            help='Probability that a participant drops right after joining')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for drop decisions')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark seminar and users')
+
+    def handle(self, *args, **options):
+        if options['participants'] <= 0 or options['capacity'] <= 0 or options['workers'] <= 0:
+            raise CommandError('--participants, --capacity and --workers should be positive numbers')
+
+        seminar, users = self._setup(options['participants'], options['capacity'])
+        try:
+            latencies, statuses, elapsed = self._run(seminar, users, options)
+            self._report(seminar, latencies, statuses, elapsed)
+        finally:
+            if not options['keep']:
+                seminar.delete()
+                User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def _setup(self, participant_count, capacity):
+        prefix = f'bench_{uuid4().hex[:8]}'
+        with transaction.atomic():
+            seminar = Seminar.objects.create(name=prefix, capacity=capacity, count=1, time='00:00')
+            User.objects.bulk_create([User(username=f'{prefix}_{i}') for i in range(participant_count)])
+            users = list(User.objects.filter(username__startswith=f'{prefix}_'))
+            ParticipantProfile.objects.bulk_create([ParticipantProfile(user=user) for user in users])
+        return seminar, list(User.objects.filter(pk__in=[user.pk for user in users]).select_related('participant'))
+
+    def _run(self, seminar, users, options):
+        factory = APIRequestFactory()
+        view = SeminarViewSet.as_view({'post': 'user', 'delete': 'user'})
+        url = f'/api/v1/seminar/{seminar.pk}/user/'
+        rand = random.Random(options['seed'])
+        drops = {user.pk: rand.random() < options['drop_ratio'] for user in users}
+
+        def request(method, user):
+            request = getattr(factory, method)(url, {'role': UserSeminar.PARTICIPANT}, format='json')
+            force_authenticate(request, user=user)
+            start = time.perf_counter()
+            try:
+                status_code = view(request, pk=seminar.pk).status_code
+            except Exception as e:
+                # lock timeout 등도 결과로 집계
+                status_code = type(e).__name__
+            return time.perf_counter() - start, status_code
+
+        def worker(user):
+            results = []
+            try:
+                latency, status_code = request('post', user)
+                results.append(('join', latency, status_code))
+                if status_code == 201 and drops[user.pk]:
+                    latency, status_code = request('delete', user)
+                    results.append(('drop', latency, status_code))
+            finally:
+                connection.close()
+            return results
+
+        latencies = defaultdict(list)
+        statuses = Counter()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for results in executor.map(worker, users):
+                for operation, latency, status_code in results:
+                    latencies[operation].append(latency)
+                    statuses[(operation, status_code)] += 1
+        return latencies, statuses, time.perf_counter() - start
+
+    def _report(self, seminar, latencies, statuses, elapsed):
+        request_count = sum(len(values) for values in latencies.values())
+        self.stdout.write(f'{request_count} requests in {elapsed:.3f}s ({request_count / elapsed:.1f} req/s)')
+        for operation, values in sorted(latencies.items()):
+            values.sort()
+            self.stdout.write(
+                f'{operation}: n={len(values)} '
+                f'p50={percentile(values, 50) * 1000:.1f}ms '
+                f'p95={percentile(values, 95) * 1000:.1f}ms '
+                f'p99={percentile(values, 99) * 1000:.1f}ms'
+            )
+        for (operation, status_code), count in sorted(statuses.items(), key=str):
+            self.stdout.write(f'{operation} {status_code}: {count}')
+
+        seminar.refresh_from_db()
+        active_count = seminar.user_seminars.filter(role=UserSeminar.PARTICIPANT, is_active=True).count()
+        self.stdout.write(
+            f'active participants: {active_count} / capacity {seminar.capacity} '
+            f'(participant_count {seminar.participant_count})'
+        )
+        if active_count > seminar.capacity:
+            raise CommandError('Active participants exceeded the seminar capacity')
+        if active_count != seminar.participant_count:
+            raise CommandError('Seminar.participant_count drifted from active participants')
+
+        # 예외로 끝난 request가 있으면 그 경로(예: join 후 drop)는 측정되지 않은 것
+        errors = Counter()
+        for (operation, status_code), count in statuses.items():
+            if isinstance(status_code, str):
+                errors[f'{operation} {status_code}'] += count
+        if errors:
+            failed = ', '.join(f'{name}: {count}' for name, count in sorted(errors.items()))
+            raise CommandError(
+                f'Invalid run, requests failed with errors ({failed}). SQLite fails concurrent writers with '
+                '"database is locked", benchmark against MySQL or use --workers 1'
+            )
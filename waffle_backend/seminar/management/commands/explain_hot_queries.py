@@ -0,0 +1,124 @@
+import json
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from seminar.compiled import seminar_rows, user_seminar_rows
+from seminar.models import Seminar, UserSeminar, WaitlistEntry
+from seminar.pagination import SeminarCursorPagination
+from seminar.search import search_seminars
+from seminar.serializers import SeminarSerializer
+from user.serializers import UserSerializer
+
+# 실제 값은 plan과 무관하므로 placeholder id 사용
+SEMINAR_ID = 1
+USER_ID = 1
+
+
+def _seminar_page(query_params=None):
+    # SeminarViewSet.list와 같은 queryset의 첫 page (CursorPagination은 page_size + 1개를 가져옴)
+    query_params = query_params or {}
+    seminars = Seminar.objects.all()
+    if 'search' in query_params:
+        seminars = search_seminars(seminars, query_params['search'])
+
+    pagination = SeminarCursorPagination()
+    request = Request(RequestFactory().get('/api/v1/seminar/', query_params))
+    ordering = pagination.get_ordering(request, seminars, None)
+    return seminar_rows(seminars).order_by(*ordering)[:pagination.page_size + 1]
+
+
+def _prefetch_queries(queryset, field, pk):
+    # setup_eager_loading의 Prefetch queryset에 prefetch_related가 붙이는 <field>__in 조건
+    return {
+        lookup.to_attr: lookup.queryset.filter(**{f'{field}__in': [pk]})
+        for lookup in queryset._prefetch_related_lookups
+    }
+
+
+def _hot_queries():
+    # view/serializer/helper가 만드는 queryset 그대로 (exists()/count()는 같은 WHERE의 SELECT로)
+    user_seminars = UserSeminar.objects.filter(user_id=USER_ID)
+    seminar_prefetches = _prefetch_queries(
+        SeminarSerializer.setup_eager_loading(Seminar.objects.all()), 'seminar_id', SEMINAR_ID
+    )
+    user_prefetches = _prefetch_queries(UserSerializer.setup_eager_loading(User.objects.all()), 'user_id', USER_ID)
+    return {
+        'seminar list': _seminar_page(),
+        'seminar list (earliest)': _seminar_page({'order': 'earliest'}),
+        'seminar search': _seminar_page({'search': 'backend'}),
+        'seminar user seminars': user_seminar_rows([SEMINAR_ID]),
+        'seminar instructors': seminar_prefetches['instructor_seminars'],
+        'seminar participants': seminar_prefetches['participant_seminars'],
+        'seminar active participants': UserSeminar.objects.filter(
+            seminar_id=SEMINAR_ID, role=UserSeminar.PARTICIPANT, is_active=True
+        ).values('id'),
+        'user joined seminar': user_seminars.filter(seminar_id=SEMINAR_ID).values('id')[:1],
+        'user instructor seminar': user_seminars.filter(role=UserSeminar.INSTRUCTOR).values('id')[:1],
+        'user participant seminars': user_prefetches['participant_seminars'],
+        'user instructor seminars': user_prefetches['instructor_seminars'],
+        'seminar waitlist head': WaitlistEntry.objects.filter(seminar_id=SEMINAR_ID).order_by('id')[:1],
+    }
+
+
+def _mysql_full_scans(plan):
+    plan = json.loads(plan)
+    full_scans = []
+
+    def visit(node):
+        if isinstance(node, dict):
+            if node.get('access_type') == 'ALL':
+                full_scans.append(node.get('table_name'))
+            for value in node.values():
+                visit(value)
+        elif isinstance(node, list):
+            for value in node:
+                visit(value)
+
+    visit(plan)
+    return full_scans
+
+
+def _sqlite_full_scans(plan):
+    # 'SCAN TABLE x' / 'SCAN x' 중 index를 쓰지 않는 것
+    full_scans = []
+    for line in plan.splitlines():
+        match = re.search(r'\bSCAN (?:TABLE )?(\w+)', line)
+        if match and 'USING' not in line[match.end():]:
+            full_scans.append(match.group(1))
+    return full_scans
+
+
+def explain(queryset):
+    if connection.vendor == 'mysql':
+        plan = queryset.explain(format='json')
+        return plan, _mysql_full_scans(plan)
+    if connection.vendor == 'sqlite':
+        plan = queryset.explain()
+        return plan, _sqlite_full_scans(plan)
+    raise CommandError(f'EXPLAIN check is not supported on {connection.vendor}')
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot seminar/user queries and fail if any of them falls back to a full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plan', action='store_true', help='Print the query plan of every query')
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, queryset in _hot_queries().items():
+            plan, full_scans = explain(queryset)
+            status = f"FULL SCAN ({', '.join(full_scans)})" if full_scans else 'ok'
+            self.stdout.write(f'{name}: {status}')
+            if options['verbose_plan']:
+                self.stdout.write(plan)
+            if full_scans:
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f"Full table scan in: {', '.join(failures)}")
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, transaction
+
+from seminar.waitlist import promote_waiters, seminars_to_promote
+
+
+class Command(BaseCommand):
+    help = (
+        'Promote waitlisted participants into seminars with free seats, in batches, '
+        'looping until interrupted (or once with --once)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Number of seminars per batch, and of waiters promoted per seminar per batch')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when there is nothing to promote')
+        parser.add_argument('--once', action='store_true', help='Process until idle once and exit')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0 or options['interval'] < 0:
+            raise CommandError('--batch-size should be positive and --interval should not be negative')
+
+        try:
+            while True:
+                # 오래 떠 있는 process이므로 request처럼 connection 정리
+                close_old_connections()
+                promoted = self.process_batch(options['batch_size'])
+                if promoted:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def process_batch(self, batch_size):
+        promoted = 0
+        for seminar_id in seminars_to_promote(batch_size):
+            # seminar 하나씩 짧은 transaction으로 (join/drop의 seminar row lock을 오래 막지 않도록)
+            with transaction.atomic():
+                user_ids = promote_waiters(seminar_id, limit=batch_size)
+            if user_ids:
+                self.stdout.write(f'Seminar {seminar_id}: promoted {len(user_ids)} waiters')
+            promoted += len(user_ids)
+        return promoted
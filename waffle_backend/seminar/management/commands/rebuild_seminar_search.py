@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from seminar.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the n-gram search index of seminar names'
+
+    def handle(self, *args, **options):
+        token_count = rebuild_search_index()
+        self.stdout.write(f'Indexed {token_count} seminar search tokens')
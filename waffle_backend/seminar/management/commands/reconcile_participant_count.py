@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from seminar.cache import invalidate_seminar
+from seminar.models import Seminar, UserSeminar
+
+
+def reconcile_participant_count(dry_run=False):
+    active_participants = Q(user_seminars__role=UserSeminar.PARTICIPANT, user_seminars__is_active=True)
+    drifted = list(
+        Seminar.objects.annotate(active_count=Count('user_seminars', filter=active_participants))
+        .exclude(participant_count=F('active_count'))
+        .values_list('id', 'participant_count', 'active_count')
+    )
+
+    if drifted and not dry_run:
+        # 확인 이후의 join/drop도 반영되도록 UPDATE 안에서 다시 count
+        active_count = UserSeminar.objects.filter(
+            seminar=OuterRef('pk'), role=UserSeminar.PARTICIPANT, is_active=True
+        ).order_by().values('seminar').annotate(count=Count('id')).values('count')
+        with transaction.atomic():
+            Seminar.objects.filter(pk__in=[seminar_id for seminar_id, _, _ in drifted]).update(
+                participant_count=Coalesce(Subquery(active_count), 0)
+            )
+            # cache된 seminar와 "seminar full" 표시는 이전 participant_count 기준
+            for seminar_id, _, _ in drifted:
+                invalidate_seminar(seminar_id)
+    return drifted
+
+
+class Command(BaseCommand):
+    help = 'Repair Seminar.participant_count drift from active participant UserSeminar rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted seminars')
+
+    def handle(self, *args, **options):
+        drifted = reconcile_participant_count(options['dry_run'])
+        for seminar_id, participant_count, active_count in drifted:
+            self.stdout.write(f'Seminar {seminar_id}: participant_count {participant_count} -> {active_count}')
+        self.stdout.write(f'{len(drifted)} seminars drifted' + (' (dry run)' if options['dry_run'] else ''))
@@ -0,0 +1,29 @@
+# Generated by Django 3.1.13 on 2026-10-17 02:52
+
+from django.db import migrations, models
+
+
+def fill_participant_count(apps, schema_editor):
+    Seminar = apps.get_model('seminar', 'Seminar')
+    UserSeminar = apps.get_model('seminar', 'UserSeminar')
+
+    counts = UserSeminar.objects.filter(role='participant', is_active=True).order_by() \
+        .values('seminar_id').annotate(count=models.Count('id')).values_list('seminar_id', 'count')
+    for seminar_id, count in counts:
+        Seminar.objects.filter(pk=seminar_id).update(participant_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seminar', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seminar',
+            name='participant_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_participant_count, migrations.RunPython.noop),
+    ]
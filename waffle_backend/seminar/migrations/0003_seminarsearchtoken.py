@@ -0,0 +1,51 @@
+# Generated by Django 3.1.13 on 2026-10-17 02:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+NGRAM_SIZE = 2
+
+
+def tokenize(text):
+    # seminar.search.tokenize의 이 migration 시점 사본 (이후 tokenizer가 바뀌면 rebuild_seminar_search로 다시 만듦)
+    tokens = set()
+    for word in text.lower().split():
+        if len(word) <= NGRAM_SIZE:
+            tokens.add(word)
+            continue
+        tokens.update(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+    return tokens
+
+
+def build_search_index(apps, schema_editor):
+    Seminar = apps.get_model('seminar', 'Seminar')
+    SeminarSearchToken = apps.get_model('seminar', 'SeminarSearchToken')
+
+    SeminarSearchToken.objects.bulk_create([
+        SeminarSearchToken(seminar_id=seminar.id, token=token)
+        for seminar in Seminar.objects.only('id', 'name')
+        for token in tokenize(seminar.name)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seminar', '0002_seminar_participant_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeminarSearchToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, max_length=100)),
+                ('seminar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='seminar.seminar')),
+            ],
+            options={
+                'unique_together': {('seminar', 'token')},
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.13 on 2026-10-17 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seminar', '0003_seminarsearchtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seminar',
+            index=models.Index(fields=['created_at', 'id'], name='seminar_created_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.13 on 2026-10-17 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seminar', '0004_seminar_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userseminar',
+            index=models.Index(fields=['seminar', 'role', 'is_active'], name='userseminar_seminar_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userseminar',
+            index=models.Index(fields=['user', 'role'], name='userseminar_user_role_idx'),
+        ),
+    ]
@@ -10,10 +10,18 @@ class Seminar(models.Model):
     count = models.PositiveSmallIntegerField()
     time = models.TimeField()
     online = models.BooleanField(default=True)
+    # active participant 수, join/drop에서 F()로만 갱신 (reconcile_participant_count로 복구)
+    participant_count = models.PositiveSmallIntegerField(default=0)
 
-    created_at = models.DateTimeField(auto_now_add=True) # TODO db_index=True
+    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # SeminarCursorPagination의 (created_at, id) 정렬
+            models.Index(fields=['created_at', 'id'], name='seminar_created_at_id_idx'),
+        ]
+
 
 class UserSeminar(models.Model):
     PARTICIPANT = 'participant'
@@ -41,3 +49,37 @@ class UserSeminar(models.Model):
         unique_together = (
             ('user', 'seminar')
         )
+        indexes = [
+            # seminar별 role/is_active 조회 (instructors, participants, participant 수)
+            models.Index(fields=['seminar', 'role', 'is_active'], name='userseminar_seminar_role_idx'),
+            # user별 role 조회 (담당 seminar, participant seminars)
+            models.Index(fields=['user', 'role'], name='userseminar_user_role_idx'),
+        ]
+
+
+class SeminarSearchToken(models.Model):
+    # Seminar.name의 n-gram inverted index (seminar/search.py에서 관리)
+    seminar = models.ForeignKey(Seminar, related_name='search_tokens', on_delete=models.CASCADE)
+    token = models.CharField(max_length=100, db_index=True)
+
+    class Meta:
+        unique_together = (
+            ('seminar', 'token')
+        )
+
+
+class WaitlistEntry(models.Model):
+    # 정원이 찬 seminar의 participant join 대기열, seminar별 id 순서(FIFO)로 처리 (seminar/waitlist.py)
+    user = models.ForeignKey(User, related_name='waitlist_entries', on_delete=models.CASCADE)
+    seminar = models.ForeignKey(Seminar, related_name='waitlist_entries', on_delete=models.CASCADE)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (
+            ('user', 'seminar')
+        )
+        indexes = [
+            # seminar별 대기 순서
+            models.Index(fields=['seminar', 'id'], name='waitlist_seminar_id_idx'),
+        ]
@@ -0,0 +1,118 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class SeminarCursorPagination(CursorPagination):
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        # 기존 ?order=earliest 유지, id는 created_at이 같은 row들 사이의 tie-breaker
+        if request.query_params.get('order') == 'earliest':
+            ordering = ('created_at', 'id')
+        else:
+            ordering = ('-created_at', '-id')
+
+        # ?search= 결과는 rank 순
+        if 'search_rank' in queryset.query.annotations:
+            ordering = ('-search_rank', ) + ordering
+        return ordering
+
+    # CursorPagination은 ordering[0]만 position으로 쓰고 같은 값은 offset(최대 offset_cutoff)으로 넘김
+    # -> search_rank나 같은 created_at이 많으면 page가 밀리므로 ordering 전체(id까지)를 position으로
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [order.lstrip('-') for order in ordering]
+        if isinstance(instance, dict):
+            values = [instance[field] for field in fields]
+        else:
+            values = [getattr(instance, field) for field in fields]
+        return json.dumps([str(value) for value in values])
+
+    def _filter_after(self, queryset, position, reverse):
+        try:
+            position = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list) or len(position) != len(self.ordering)
+                or not all(isinstance(value, str) for value in position)):
+            raise NotFound(self.invalid_cursor_message)
+
+        # (a, b, c) > (x, y, z) == a > x or (a = x and (b > y or (b = y and c > z)))
+        after = Q()
+        equal = {}
+        for order, value in zip(self.ordering, position):
+            field = order.lstrip('-')
+            lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+            after |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+
+        # 첫 field의 범위 조건을 따로 두어 index range scan이 가능하도록
+        first = self.ordering[0]
+        lookup = 'lte' if reverse != first.startswith('-') else 'gte'
+        try:
+            return queryset.filter(Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}), after)
+        except (ValidationError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # position filter 외에는 CursorPagination.paginate_queryset과 같음
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*[
+                order[1:] if order.startswith('-') else '-' + order for order in self.ordering
+            ])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = self._filter_after(queryset, current_position, reverse)
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
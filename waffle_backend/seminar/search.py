@@ -0,0 +1,58 @@
+import math
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from seminar.models import Seminar, SeminarSearchToken
+
+NGRAM_SIZE = 2
+
+
+def tokenize(text):
+    # 단어별 n-gram (n보다 짧은 단어는 단어 그대로), 한글 이름도 bigram으로 부분 검색 가능
+    tokens = set()
+    for word in text.lower().split():
+        if len(word) <= NGRAM_SIZE:
+            tokens.add(word)
+            continue
+        tokens.update(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+    return tokens
+
+
+def _search_tokens(seminar):
+    return [SeminarSearchToken(seminar_id=seminar.pk, token=token) for token in tokenize(seminar.name)]
+
+
+@transaction.atomic
+def index_seminar(seminar):
+    SeminarSearchToken.objects.filter(seminar_id=seminar.pk).delete()
+    SeminarSearchToken.objects.bulk_create(_search_tokens(seminar))
+
+
+@transaction.atomic
+def rebuild_search_index(batch_size=1000):
+    SeminarSearchToken.objects.all().delete()
+
+    token_count = 0
+    search_tokens = []
+    for seminar in Seminar.objects.only('id', 'name').iterator(chunk_size=batch_size):
+        search_tokens += _search_tokens(seminar)
+        if len(search_tokens) >= batch_size:
+            SeminarSearchToken.objects.bulk_create(search_tokens)
+            token_count += len(search_tokens)
+            search_tokens = []
+    SeminarSearchToken.objects.bulk_create(search_tokens)
+    return token_count + len(search_tokens)
+
+
+def search_seminars(queryset, query):
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset.none()
+
+    # search_rank: query의 n-gram 중 name에 포함된 개수, SEMINAR_SEARCH_MIN_MATCH 비율 이상만
+    min_rank = max(1, math.ceil(len(tokens) * settings.SEMINAR_SEARCH_MIN_MATCH))
+    return queryset.filter(search_tokens__token__in=tokens) \
+        .annotate(search_rank=Count('search_tokens')) \
+        .filter(search_rank__gte=min_rank)
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from seminar.models import UserSeminar, Seminar
@@ -23,16 +24,47 @@ class SeminarSerializer(serializers.ModelSerializer):
 
 
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # role별로 나눈 user_seminars(+ user)를 한 번에 prefetch -> seminar 수와 관계없이 query 수 일정
+        return queryset.prefetch_related(
+            Prefetch(
+                'user_seminars',
+                queryset=UserSeminar.objects.filter(role=UserSeminar.INSTRUCTOR).select_related('user').order_by('id'),
+                to_attr='instructor_seminars',
+            ),
+            Prefetch(
+                'user_seminars',
+                queryset=UserSeminar.objects.filter(role=UserSeminar.PARTICIPANT).select_related('user').order_by('id'),
+                to_attr='participant_seminars',
+            ),
+        )
+
     def get_instructors(self, seminar):
-        instructors_seminars = seminar.user_seminars.filter(role=UserSeminar.INSTRUCTOR)
+        if hasattr(seminar, 'instructor_seminars'):
+            instructors_seminars = seminar.instructor_seminars
+        else:
+            instructors_seminars = seminar.user_seminars.filter(role=UserSeminar.INSTRUCTOR).select_related('user') \
+                .order_by('id')
 
         return InstructorOfSeminarSerializer(instructors_seminars, many=True, context=self.context).data
 
     def get_participants(self, seminar):
-        participants_seminars = seminar.user_seminars.filter(role=UserSeminar.PARTICIPANT)
+        if hasattr(seminar, 'participant_seminars'):
+            participants_seminars = seminar.participant_seminars
+        else:
+            participants_seminars = seminar.user_seminars.filter(role=UserSeminar.PARTICIPANT).select_related('user') \
+                .order_by('id')
 
         return ParticipantOfSeminarSerializer(participants_seminars, many=True, context=self.context).data
 
+    def update(self, seminar, validated_data):
+        for attr, value in validated_data.items():
+            setattr(seminar, attr, value)
+        # participant_count는 join/drop에서 F()로만 갱신 -> 전체 save로 stale 값을 덮어쓰지 않도록
+        seminar.save(update_fields=[*validated_data, 'updated_at'])
+        return seminar
+
     # TODO validation?
 
 
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from seminar.cache import invalidate_seminar
+from seminar.models import Seminar, UserSeminar
+from seminar.search import index_seminar
+
+
+@receiver(post_save, sender=Seminar)
+def index_seminar_on_save(sender, instance, update_fields=None, **kwargs):
+    # SeminarSearchToken은 post_delete 때 CASCADE로 같이 삭제됨
+    if update_fields is None or 'name' in update_fields:
+        index_seminar(instance)
+
+
+@receiver(post_save, sender=Seminar)
+@receiver(post_delete, sender=Seminar)
+def invalidate_seminar_on_change(sender, instance, **kwargs):
+    invalidate_seminar(instance.pk)
+
+
+@receiver(post_save, sender=UserSeminar)
+@receiver(post_delete, sender=UserSeminar)
+def invalidate_seminar_on_user_seminar_change(sender, instance, **kwargs):
+    invalidate_seminar(instance.seminar_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_seminars_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    # instructors/participants에 user 정보가 포함됨 (삭제는 UserSeminar CASCADE에서 처리)
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    for seminar_id in UserSeminar.objects.filter(user_id=instance.pk).values_list('seminar_id', flat=True):
+        invalidate_seminar(seminar_id)
@@ -1,3 +1,741 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.authtoken.models import Token
+
+from seminar.compiled import compile_seminars, load_user_seminars, seminar_rows
+from seminar.management.commands.process_waitlist import Command as ProcessWaitlistCommand
+from seminar.models import Seminar, UserSeminar, WaitlistEntry
+from seminar.serializers import SeminarSerializer
+from seminar.views import SeminarViewSet
+from user.authentication import token_cache
+from user.models import InstructorProfile, ParticipantProfile
+from waffle_backend.db.routers import ReplicaRouter, get_read_database, read_from, select_read_database
+from waffle_backend.metrics import registry
+from waffle_backend.renderers import FastJSONRenderer
+
+
+class GetSeminarQueryCountTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        user = User.objects.create_user(username='reader', password='password')
+        self.token = 'Token ' + Token.objects.create(user=user).key
+        self.seminar_index = 0
+        # token 인증은 cache되므로 첫 request 이후부터 비교
+        self.client.get('/api/v1/seminar/', HTTP_AUTHORIZATION=self.token)
+
+    def _create_seminar(self, participant_count=2):
+        self.seminar_index += 1
+        seminar = Seminar.objects.create(
+            name=f'seminar{self.seminar_index}', capacity=10, count=5, time='14:00'
+        )
+        instructor = User.objects.create_user(username=f'inst{self.seminar_index}', password='password')
+        InstructorProfile.objects.create(user=instructor)
+        UserSeminar.objects.create(user=instructor, seminar=seminar, role=UserSeminar.INSTRUCTOR)
+        for i in range(participant_count):
+            participant = User.objects.create_user(username=f'part{self.seminar_index}_{i}', password='password')
+            ParticipantProfile.objects.create(user=participant)
+            UserSeminar.objects.create(user=participant, seminar=seminar, role=UserSeminar.PARTICIPANT)
+        return seminar
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.json()
+
+    def test_get_seminar_list_query_count(self):
+        self._create_seminar()
+        query_count, data = self._count_queries('/api/v1/seminar/')
+        self.assertEqual(len(data['results']), 1)
+
+        for _ in range(4):
+            self._create_seminar(participant_count=3)
+        self.assertEqual(self._count_queries('/api/v1/seminar/')[0], query_count)
+
+    def test_get_seminar_query_count(self):
+        seminar = self._create_seminar(participant_count=1)
+        query_count, data = self._count_queries(f'/api/v1/seminar/{seminar.id}/')
+        self.assertEqual(len(data['instructors']), 1)
+        self.assertEqual(len(data['participants']), 1)
+
+        seminar = self._create_seminar(participant_count=5)
+        query_count_many, data = self._count_queries(f'/api/v1/seminar/{seminar.id}/')
+        self.assertEqual(query_count_many, query_count)
+        self.assertEqual(data['instructors'][0]['username'], f'inst{self.seminar_index}')
+        self.assertEqual(len(data['participants']), 5)
+
+
+class GetSeminarListPaginationTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        user = User.objects.create_user(username='reader', password='password')
+        self.token = 'Token ' + Token.objects.create(user=user).key
+        for i in range(5):
+            Seminar.objects.create(name=f'seminar{i}', capacity=10, count=5, time='14:00')
+
+    def _get_names(self, url, link='next'):
+        names = []
+        while url:
+            response = self.client.get(url, HTTP_AUTHORIZATION=self.token)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            self.assertLessEqual(len(data['results']), 2)
+            page = [seminar['name'] for seminar in data['results']]
+            names = names + page if link == 'next' else page + names
+            last, url = url, data[link]
+        return names, last
+
+    def test_get_seminar_list_pagination(self):
+        names = [f'seminar{i}' for i in range(5)]
+        self.assertEqual(self._get_names('/api/v1/seminar/?page_size=2&order=earliest')[0], names)
+        self.assertEqual(self._get_names('/api/v1/seminar/?page_size=2')[0], names[::-1])
+
+    def test_get_seminar_list_pagination_same_created_at(self):
+        # 모든 created_at이 같아도 id로 page가 이어짐 (next, previous 모두)
+        Seminar.objects.update(created_at=timezone.now())
+        names = [f'seminar{i}' for i in range(5)]
+        for url, expected in (
+            ('/api/v1/seminar/?page_size=2&order=earliest', names),
+            ('/api/v1/seminar/?page_size=2', names[::-1]),
+        ):
+            forward, last = self._get_names(url)
+            self.assertEqual(forward, expected)
+            self.assertEqual(self._get_names(last, link='previous')[0], expected)
+
+    def test_get_seminar_list_invalid_cursor(self):
+        # position이 JSON이 아닌 cursor, created_at 자리에 datetime이 아닌 값이 있는 cursor
+        for cursor in ('cD14', 'cD0lNUIlMjJ4JTIyJTJDKyUyMjElMjIlNUQ='):
+            response = self.client.get('/api/v1/seminar/', {'cursor': cursor}, HTTP_AUTHORIZATION=self.token)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostSeminarUserTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        # throttle과 "seminar full" 표시는 cache에
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=1, count=5, time='14:00')
+        self.tokens = []
+        for i in range(2):
+            participant = User.objects.create_user(username=f'part{i}', password='password')
+            ParticipantProfile.objects.create(user=participant)
+            self.tokens.append('Token ' + Token.objects.create(user=participant).key)
+
+    def _join(self, token):
+        return self.client.post(
+            f'/api/v1/seminar/{self.seminar.id}/user/',
+            {"role": "participant"},
+            HTTP_AUTHORIZATION=token
+        )
+
+    def test_post_seminar_user_capacity(self):
+        response = self._join(self.tokens[0])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.json()['participants']), 1)
+
+        response = self._join(self.tokens[0])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self._join(self.tokens[1])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 1)
+
+        response = self.client.delete(
+            f'/api/v1/seminar/{self.seminar.id}/user/',
+            json.dumps({"role": "participant"}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=self.tokens[0]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()['participants'][0]['is_active'])
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 0)
+
+        response = self._join(self.tokens[1])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 1)
+
+    def test_reconcile_participant_count(self):
+        self._join(self.tokens[0])
+        Seminar.objects.filter(pk=self.seminar.pk).update(participant_count=0)
+
+        call_command('reconcile_participant_count', stdout=StringIO())
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 1)
+
+    def test_reconcile_participant_count_invalidates_seminar(self):
+        # 늘어난 participant_count로 "seminar full"이 표시된 뒤 reconcile하면 다시 join 가능
+        Seminar.objects.filter(pk=self.seminar.pk).update(participant_count=1)
+        self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_400_BAD_REQUEST)
+
+        call_command('reconcile_participant_count', stdout=StringIO())
+        self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_201_CREATED)
+
+
+class RequestMetricsTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+        user = User.objects.create_user(username='reader', password='password')
+        self.token = 'Token ' + Token.objects.create(user=user).key
+        admin = User.objects.create_superuser(username='admin', password='password')
+        self.admin_token = 'Token ' + Token.objects.create(user=admin).key
+        Seminar.objects.create(name='seminar', capacity=10, count=5, time='14:00')
+
+    def test_get_seminar_server_timing(self):
+        response = self.client.get('/api/v1/seminar/', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'^db_connect;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, total;dur=')
+
+        response = self.client.get('/api/v1/_metrics', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get('/api/v1/_metrics', HTTP_AUTHORIZATION=self.admin_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        seminar_list = response.json()['endpoints']['GET seminar:seminar-list']
+        self.assertEqual(seminar_list['count'], 1)
+        self.assertGreater(seminar_list['queries']['max'], 0)
+        self.assertGreater(seminar_list['serialize_ms']['mean'], 0)
+
+
+class GetSeminarSearchTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        user = User.objects.create_user(username='reader', password='password')
+        self.token = 'Token ' + Token.objects.create(user=user).key
+        for name in ('Django Backend', 'React Frontend', '백엔드 세미나', 'Backend Basics'):
+            Seminar.objects.create(name=name, capacity=10, count=5, time='14:00')
+
+    def _search(self, query, page_size=10):
+        response = self.client.get('/api/v1/seminar/', {'search': query, 'page_size': page_size},
+                                   HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_get_seminar_search(self):
+        self.assertEqual([seminar['name'] for seminar in self._search('backend')['results']],
+                         ['Backend Basics', 'Django Backend'])
+        self.assertEqual([seminar['name'] for seminar in self._search('백엔드')['results']], ['백엔드 세미나'])
+        self.assertEqual(self._search('kotlin')['results'], [])
+
+        # 더 많은 n-gram이 맞는 seminar가 먼저
+        with self.settings(SEMINAR_SEARCH_MIN_MATCH=0.5):
+            self.assertEqual([seminar['name'] for seminar in self._search('backend basic')['results']],
+                             ['Backend Basics', 'Django Backend'])
+
+        data = self._search('backend', page_size=1)
+        self.assertEqual(len(data['results']), 1)
+        data = self.client.get(data['next'], HTTP_AUTHORIZATION=self.token).json()
+        self.assertEqual([seminar['name'] for seminar in data['results']], ['Django Backend'])
+
+    def test_update_seminar_search_index(self):
+        seminar = Seminar.objects.get(name='React Frontend')
+        seminar.name = 'Kotlin Server'
+        seminar.save()
+        self.assertEqual([seminar['name'] for seminar in self._search('kotlin')['results']], ['Kotlin Server'])
+        self.assertEqual(self._search('react')['results'], [])
+
+        Seminar.objects.all().delete()
+        call_command('rebuild_seminar_search', stdout=StringIO())
+        self.assertEqual(self._search('backend')['results'], [])
+
+
+class BenchEnrollmentTestCase(TransactionTestCase):
+    # worker thread들이 data를 볼 수 있도록 commit되는 TransactionTestCase로
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_bench_enrollment(self):
+        stdout = StringIO()
+        call_command(
+            'bench_enrollment', '--users', '6', '--capacity', '3', '--workers', '1', '--drop-ratio', '1', '--seed', '0',
+            stdout=stdout
+        )
+        self.assertIn('join 201: 6', stdout.getvalue())
+        self.assertIn('drop 200: 6', stdout.getvalue())
+        self.assertFalse(Seminar.objects.exists())
+
+
+class ExplainHotQueriesTestCase(TestCase):
+
+    def test_explain_hot_queries(self):
+        # full scan이 있으면 CommandError
+        call_command('explain_hot_queries', stdout=StringIO())
+
+
+class PostSeminarUserBulkTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        self.seminar = Seminar.objects.create(name='seminar', capacity=3, count=5, time='14:00')
+        instructor = User.objects.create_user(username='inst', password='password')
+        InstructorProfile.objects.create(user=instructor)
+        UserSeminar.objects.create(user=instructor, seminar=self.seminar, role=UserSeminar.INSTRUCTOR)
+        self.instructor_token = 'Token ' + Token.objects.create(user=instructor).key
+
+        self.participants = []
+        for i in range(5):
+            participant = User.objects.create_user(username=f'part{i}', password='password')
+            ParticipantProfile.objects.create(user=participant, accepted=i != 1)
+            self.participants.append(participant)
+        self.participant_token = 'Token ' + Token.objects.create(user=self.participants[0]).key
+
+        self.client.post(
+            f'/api/v1/seminar/{self.seminar.id}/user/',
+            {"role": "participant"},
+            HTTP_AUTHORIZATION=self.participant_token
+        )
+
+    def _bulk_join(self, user_ids, token):
+        return self.client.post(
+            f'/api/v1/seminar/{self.seminar.id}/user/bulk/',
+            json.dumps({"user_ids": user_ids}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=token
+        )
+
+    def test_post_seminar_user_bulk(self):
+        user_ids = [participant.id for participant in self.participants]
+
+        response = self._bulk_join(user_ids, self.participant_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self._bulk_join('wrong', self.instructor_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self._bulk_join(user_ids + [9999], self.instructor_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        data = response.json()
+        self.assertEqual(data['enrolled'], user_ids[2:4])
+        self.assertEqual(
+            {rejected['id']: rejected['error'] for rejected in data['rejected']},
+            {
+                user_ids[0]: "User has already joined this seminar",
+                user_ids[1]: "User is not accepted",
+                user_ids[4]: "This seminar is already full",
+                9999: "User does not exist",
+            }
+        )
+        self.assertEqual(len(data['seminar']['participants']), 3)
+
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 3)
+
+
+class GetSeminarConditionalTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=10, count=5, time='14:00')
+        self.participant = User.objects.create_user(username='part', password='password')
+        ParticipantProfile.objects.create(user=self.participant)
+        self.token = 'Token ' + Token.objects.create(user=self.participant).key
+
+    def _get(self, url, etag=None):
+        if etag:
+            return self.client.get(url, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag)
+        return self.client.get(url, HTTP_AUTHORIZATION=self.token)
+
+    def test_get_seminar_not_modified(self):
+        for url in (f'/api/v1/seminar/{self.seminar.id}/', '/api/v1/seminar/'):
+            response = self._get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+
+            response = self._get(url, etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response.content, b'')
+
+        # seminar/user_seminar table을 aggregate하지 않음
+        list_etag = etag
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get('/api/v1/seminar/', list_etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.post(
+            f'/api/v1/seminar/{self.seminar.id}/user/',
+            {"role": "participant"},
+            HTTP_AUTHORIZATION=self.token
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self._get('/api/v1/seminar/', list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results'][0]['participants']), 1)
+
+        url = f'/api/v1/seminar/{self.seminar.id}/'
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['participants']), 1)
+        etag = response['ETag']
+
+        self.participant.first_name = 'Dabin'
+        self.participant.save()
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['participants'][0]['first_name'], 'Dabin')
+
+        self.assertEqual(self._get('/api/v1/seminar/wrong/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class GetSeminarCacheTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        registry.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(registry.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=10, count=5, time='14:00')
+        instructor = User.objects.create_user(username='inst', password='password')
+        InstructorProfile.objects.create(user=instructor)
+        UserSeminar.objects.create(user=instructor, seminar=self.seminar, role=UserSeminar.INSTRUCTOR)
+        self.instructor = instructor
+        self.instructor_token = 'Token ' + Token.objects.create(user=instructor).key
+        self.participant = User.objects.create_user(username='part', password='password')
+        ParticipantProfile.objects.create(user=self.participant)
+        self.url = f'/api/v1/seminar/{self.seminar.id}/'
+
+    def _get(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_AUTHORIZATION=self.instructor_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.json()
+
+    def _counters(self):
+        counters = registry.snapshot()['counters']
+        return counters.get('seminar_cache.hit', 0), counters.get('seminar_cache.miss', 0)
+
+    def test_get_seminar_cached(self):
+        self._get()
+        query_count, data = self._get()
+        self.assertEqual(query_count, 0)
+        self.assertEqual(self._counters(), (1, 1))
+        self.assertEqual(data['instructors'][0]['username'], 'inst')
+
+        self.instructor.first_name = 'Dabin'
+        self.instructor.save()
+        query_count, data = self._get()
+        self.assertGreater(query_count, 0)
+        self.assertEqual(data['instructors'][0]['first_name'], 'Dabin')
+
+        response = self.client.post(
+            f'{self.url}user/bulk/',
+            json.dumps({"user_ids": [self.participant.id]}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=self.instructor_token
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        query_count, data = self._get()
+        self.assertEqual(len(data['participants']), 1)
+        self.assertEqual(self._counters(), (1, 3))
+
+        self.seminar.name = 'renamed'
+        self.seminar.save()
+        query_count, data = self._get()
+        self.assertEqual(data['name'], 'renamed')
+
+
+class GetSeminarAsyncTestCase(TransactionTestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(token_cache.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=10, count=5, time='14:00')
+        user = User.objects.create_user(username='part', password='password')
+        ParticipantProfile.objects.create(user=user)
+        UserSeminar.objects.create(user=user, seminar=self.seminar, role=UserSeminar.PARTICIPANT)
+        self.token = 'Token ' + Token.objects.create(user=user).key
+
+    def test_get_seminar_async(self):
+        for path in ('seminar/', f'seminar/{self.seminar.id}/'):
+            response = self.client.get(f'/api/v1/async/{path}', HTTP_AUTHORIZATION=self.token)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), self.client.get(f'/api/v1/{path}', HTTP_AUTHORIZATION=self.token).json())
+
+        response = self.client.get(f'/api/v1/async/seminar/{self.seminar.id}/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ReplicaRoutingTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=10, count=5, time='14:00')
+        self.participant = User.objects.create_user(username='part', password='password')
+        ParticipantProfile.objects.create(user=self.participant)
+        self.token = 'Token ' + Token.objects.create(user=self.participant).key
+        self.other = User.objects.create_user(username='other', password='password')
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Seminar))
+        with read_from('replica'):
+            self.assertEqual(router.db_for_read(Seminar), 'replica')
+            self.assertEqual(router.db_for_write(Seminar), 'default')
+        with self.settings(DATABASE_REPLICAS=['replica']):
+            self.assertFalse(router.allow_migrate('replica', 'seminar'))
+            self.assertIsNone(router.allow_migrate('default', 'seminar'))
+
+    def test_list_etag_matches_primary_body(self):
+        # 'replica' alias는 없으므로 replica로 간 read가 있으면 ConnectionDoesNotExist
+        with mock.patch('waffle_backend.db.routers.select_read_database', return_value='replica'):
+            response = self.client.get('/api/v1/seminar/', HTTP_AUTHORIZATION=self.token)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+
+            Seminar.objects.create(name='new seminar', capacity=10, count=5, time='14:00')
+            response = self.client.get('/api/v1/seminar/', HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.json()['results']), 2)
+
+            response = self.client.get(
+                '/api/v1/seminar/', HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_read_database_reset_on_error(self):
+        with mock.patch('waffle_backend.db.routers.select_read_database', return_value='replica'), \
+                mock.patch.object(SeminarViewSet, 'list', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get('/api/v1/seminar/', HTTP_AUTHORIZATION=self.token)
+        self.assertIsNone(get_read_database())
+
+    def test_read_your_writes(self):
+        self.assertIsNone(select_read_database(self.participant))
+
+        with self.settings(DATABASE_REPLICAS=['replica']):
+            self.assertEqual(select_read_database(self.participant), 'replica')
+
+            response = self.client.post(
+                f'/api/v1/seminar/{self.seminar.id}/user/',
+                {"role": "participant"},
+                HTTP_AUTHORIZATION=self.token
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(select_read_database(self.participant), 'default')
+            self.assertEqual(select_read_database(self.other), 'replica')
+
+            # 실패한 쓰기는 고정하지 않음
+            cache.clear()
+            response = self.client.post(
+                f'/api/v1/seminar/{self.seminar.id}/user/',
+                {"role": "participant"},
+                HTTP_AUTHORIZATION=self.token
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(select_read_database(self.participant), 'replica')
+
+
+class CompiledSeminarParityTestCase(TestCase):
+
+    def setUp(self):
+        instructor = User.objects.create_user(username='inst', email='inst@snu.ac.kr', first_name='다빈')
+        participants = [User.objects.create_user(username=f'part{i}', last_name='a\u2028"b"') for i in range(3)]
+        empty = Seminar.objects.create(name='empty', capacity=10, count=5, time='09:05', online=False)
+        seminar = Seminar.objects.create(name='와플 "seminar"\n', capacity=10, count=5, time='14:00')
+        UserSeminar.objects.create(user=instructor, seminar=seminar, role=UserSeminar.INSTRUCTOR)
+        for participant in reversed(participants):
+            UserSeminar.objects.create(user=participant, seminar=seminar, role=UserSeminar.PARTICIPANT)
+        UserSeminar.objects.create(user=participants[0], seminar=empty, role=UserSeminar.PARTICIPANT,
+                                   is_active=False, dropped_at=timezone.now())
+
+    def test_compiled_seminars_same_bytes_as_serializer(self):
+        queryset = Seminar.objects.order_by('-created_at', '-id')
+        seminars = list(seminar_rows(queryset))
+        compiled = compile_seminars(seminars, load_user_seminars(seminars))
+        serialized = SeminarSerializer(SeminarSerializer.setup_eager_loading(queryset), many=True).data
+        self.assertEqual(FastJSONRenderer().render(compiled), JSONRenderer().render(serialized))
+        self.assertEqual(len(compiled[0]['participants']), 3)
+        self.assertIsNotNone(compiled[1]['participants'][0]['dropped_at'])
+
+
+class PostSeminarUserAdmissionTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        registry.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(registry.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=1, count=5, time='14:00')
+        self.url = f'/api/v1/seminar/{self.seminar.id}/user/'
+        self.tokens = []
+        for i in range(3):
+            participant = User.objects.create_user(username=f'part{i}', password='password')
+            ParticipantProfile.objects.create(user=participant)
+            self.tokens.append('Token ' + Token.objects.create(user=participant).key)
+
+    def _join(self, token):
+        return self.client.post(self.url, {"role": "participant"}, HTTP_AUTHORIZATION=token)
+
+    def _counter(self, name):
+        return registry.snapshot()['counters'].get(name, 0)
+
+    def test_post_seminar_user_full_cached(self):
+        self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._join(self.tokens[1]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._counter('seminar_join.full_cache.set'), 1)
+
+        # token 인증은 cache되므로 첫 request 이후부터 비교
+        self.client.get('/api/v1/seminar/', HTTP_AUTHORIZATION=self.tokens[2])
+        with CaptureQueriesContext(connection) as context:
+            response = self._join(self.tokens[2])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"error": "This seminar is already full"})
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(self._counter('seminar_join.full_cache.hit'), 1)
+
+        response = self.client.delete(
+            self.url,
+            json.dumps({"role": "participant"}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=self.tokens[0]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._join(self.tokens[2]).status_code, status.HTTP_201_CREATED)
+
+    def test_post_seminar_user_throttled(self):
+        with self.settings(SEMINAR_JOIN_USER_BURST=2, SEMINAR_JOIN_USER_RATE=0.01):
+            self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_400_BAD_REQUEST)
+            response = self._join(self.tokens[0])
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+            self.assertEqual(self._counter('seminar_join.user.throttled'), 1)
+
+            # 다른 user의 bucket은 따로
+            self.assertEqual(self._join(self.tokens[1]).status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.settings(SEMINAR_JOIN_USER_BURST=0, SEMINAR_JOIN_SEMINAR_BURST=1, SEMINAR_JOIN_SEMINAR_RATE=0.01):
+            cache.clear()
+            self.assertEqual(self._join(self.tokens[1]).status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(self._join(self.tokens[2]).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self._counter('seminar_join.seminar.throttled'), 1)
+
+    def test_post_seminar_user_throttled_user_does_not_drain_seminar(self):
+        with self.settings(SEMINAR_JOIN_USER_BURST=1, SEMINAR_JOIN_USER_RATE=0.01,
+                           SEMINAR_JOIN_SEMINAR_BURST=3, SEMINAR_JOIN_SEMINAR_RATE=0.01):
+            self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_201_CREATED)
+            for _ in range(5):
+                self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self._counter('seminar_join.user.throttled'), 5)
+
+            # user bucket에서 막힌 request는 seminar bucket을 쓰지 않음
+            self.assertEqual(self._join(self.tokens[1]).status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(self._join(self.tokens[2]).status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(self._counter('seminar_join.seminar.throttled'), 0)
+
+
+class SeminarWaitlistTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.seminar = Seminar.objects.create(name='seminar', capacity=1, count=5, time='14:00')
+        self.url = f'/api/v1/seminar/{self.seminar.id}/user/'
+        self.users = []
+        self.tokens = []
+        for i in range(5):
+            participant = User.objects.create_user(username=f'part{i}', password='password')
+            ParticipantProfile.objects.create(user=participant, accepted=i != 4)
+            self.users.append(participant)
+            self.tokens.append('Token ' + Token.objects.create(user=participant).key)
+
+    def _join(self, token, waitlist=True):
+        return self.client.post(
+            self.url,
+            json.dumps({"role": "participant", "waitlist": waitlist}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=token
+        )
+
+    def _drop(self, token):
+        return self.client.delete(
+            self.url,
+            json.dumps({"role": "participant"}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=token
+        )
+
+    def _participant_ids(self):
+        return list(self.seminar.user_seminars.filter(role=UserSeminar.PARTICIPANT, is_active=True)
+                    .order_by('id').values_list('user_id', flat=True))
+
+    def test_waitlist_promoted_on_drop(self):
+        self.assertEqual(self._join(self.tokens[0]).status_code, status.HTTP_201_CREATED)
+
+        response = self._join(self.tokens[1])
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.json(), {"waitlist": {"seminar": self.seminar.id, "position": 1}})
+        self.assertEqual(self._join(self.tokens[2]).json()["waitlist"]["position"], 2)
+        self.assertEqual(self._join(self.tokens[2]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._join(self.tokens[3], waitlist=False).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self._drop(self.tokens[0]).status_code, status.HTTP_200_OK)
+        self.assertEqual(self._participant_ids(), [self.users[1].id])
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 1)
+
+        # 대기 취소
+        self.assertEqual(self._drop(self.tokens[2]).status_code, status.HTTP_200_OK)
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    def _process_waitlist(self, batch_size):
+        # handle()의 close_old_connections()가 test transaction의 connection을 닫지 않도록 batch만
+        command = ProcessWaitlistCommand(stdout=StringIO())
+        while command.process_batch(batch_size):
+            pass
+
+    def test_process_waitlist(self):
+        self._join(self.tokens[0])
+        for token in self.tokens[1:4]:
+            self.assertEqual(self._join(token).status_code, status.HTTP_202_ACCEPTED)
+        # part4는 대기 중 accepted가 아니게 됨
+        WaitlistEntry.objects.create(user=self.users[4], seminar=self.seminar)
+        Seminar.objects.filter(pk=self.seminar.pk).update(capacity=3)
+
+        self._process_waitlist(1)
+        self.assertEqual(self._participant_ids(), [user.id for user in self.users[:3]])
+        self.assertEqual(list(WaitlistEntry.objects.order_by('id').values_list('user_id', flat=True)),
+                         [self.users[3].id, self.users[4].id])
+
+        Seminar.objects.filter(pk=self.seminar.pk).update(capacity=5)
+        self._process_waitlist(100)
+        self.assertEqual(self._participant_ids(), [user.id for user in self.users[:4]])
+        self.assertFalse(WaitlistEntry.objects.exists())
+        self.seminar.refresh_from_db()
+        self.assertEqual(self.seminar.participant_count, 4)
@@ -0,0 +1,66 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from waffle_backend.metrics import registry
+
+
+class TokenBucket:
+    # burst만큼 연속 요청을 허용하고 이후로는 초당 rate개씩 다시 채움, burst가 0이면 제한 없음
+    # SimpleRateThrottle처럼 cache get/set 사이의 race는 허용 (정확한 제한보다 DB 앞단의 부하 차단이 목적)
+
+    def __init__(self, scope, key, burst, rate):
+        self.scope = scope
+        self.key = f'throttle:{scope}:{key}'
+        self.burst = burst
+        self.rate = rate
+        self.tokens = burst
+
+    def take(self, now):
+        if self.burst <= 0:
+            return True
+
+        tokens, updated_at = cache.get(self.key, (self.burst, now))
+        self.tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if self.tokens < 1:
+            registry.incr(f'{self.scope}.throttled')
+            return False
+
+        self.tokens -= 1
+        # 다 채워지면 cache에 남겨둘 필요 없음
+        timeout = math.ceil((self.burst - self.tokens) / self.rate) + 1 if self.rate > 0 else None
+        cache.set(self.key, (self.tokens, now), timeout)
+        return True
+
+    def wait(self):
+        if self.rate <= 0:
+            return None
+        return (1 - self.tokens) / self.rate
+
+
+class SeminarJoinThrottle(BaseThrottle):
+    # user별 bucket을 먼저 확인하고, 통과한 request만 seminar별 bucket을 사용
+    # -> 한 client가 반복해서 보낸 요청이 seminar의 bucket을 비워서 다른 user까지 막지 않도록
+    timer = time.time
+
+    def get_buckets(self, request, view):
+        return (
+            TokenBucket('seminar_join.user', request.user.pk,
+                        settings.SEMINAR_JOIN_USER_BURST, settings.SEMINAR_JOIN_USER_RATE),
+            TokenBucket('seminar_join.seminar', view.kwargs.get('pk'),
+                        settings.SEMINAR_JOIN_SEMINAR_BURST, settings.SEMINAR_JOIN_SEMINAR_RATE),
+        )
+
+    def allow_request(self, request, view):
+        now = self.timer()
+        for bucket in self.get_buckets(request, view):
+            if not bucket.take(now):
+                self.throttled_bucket = bucket
+                return False
+        return True
+
+    def wait(self):
+        return self.throttled_bucket.wait()
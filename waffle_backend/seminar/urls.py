@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 from seminar.views import SeminarViewSet
+from waffle_backend.async_views import async_read_view
 
 app_name = 'seminar'
 
@@ -9,4 +10,7 @@ router.register('seminar', SeminarViewSet, basename='seminar')
 
 urlpatterns = [
     path('', include((router.urls))),
+    path('async/seminar/', async_read_view(SeminarViewSet, {'get': 'list'}), name='seminar-list-async'),
+    path('async/seminar/<int:pk>/', async_read_view(SeminarViewSet, {'get': 'retrieve'}),
+         name='seminar-detail-async'),
 ]
@@ -1,6 +1,8 @@
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
-from django.db import IntegrityError, transaction
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F
+from django.http import Http404
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.authtoken.models import Token
@@ -9,28 +11,46 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 
-from seminar.models import Seminar, UserSeminar
+from seminar.cache import (
+    get_cached_seminar, get_seminar_version, get_seminars_version, invalidate_seminar, is_seminar_full,
+    mark_seminar_full,
+)
+from seminar.compiled import compile_seminars, load_user_seminars, seminar_rows
+from seminar.models import Seminar, UserSeminar, WaitlistEntry
+from seminar.pagination import SeminarCursorPagination
+from seminar.search import search_seminars
 from seminar.serializers import SeminarSerializer
+from seminar.throttling import SeminarJoinThrottle
+from seminar.waitlist import promote_waiters, waitlist_position
+from user.cache import get_user_data_version
 from user.permissions import IsParticipant, IsInstructor
+from waffle_backend.conditional import ConditionalGetMixin
+from waffle_backend.db.routers import ReplicaReadMixin, read_from
+from waffle_backend.metrics import MetricsViewMixin, timed
 
 # Create your views here.
-class SeminarViewSet(viewsets.GenericViewSet):
+class SeminarViewSet(ReplicaReadMixin, MetricsViewMixin, ConditionalGetMixin, viewsets.GenericViewSet):
     queryset = Seminar.objects.all()
     serializer_class = SeminarSerializer
     permission_classes = (IsAuthenticated, )
+    pagination_class = SeminarCursorPagination
 
 
     def get_permissions(self):
-        if self.action in ('create', 'update'):
+        if self.action in ('create', 'update', 'bulk_user'):
             return (IsInstructor(), )
         elif self.action == 'user' and self.request.method == 'DELETE':
             return (IsParticipant(), )
         return super(SeminarViewSet, self).get_permissions()
 
+    def get_throttles(self):
+        # join만, DB를 건드리기 전에 (authentication은 token cache)
+        if self.action == 'user' and self.request.method == 'POST':
+            return (SeminarJoinThrottle(), )
+        return super(SeminarViewSet, self).get_throttles()
 
     # POST api/v1/seminar/
     def create(self, request):
-        print("DEBUG: SeminarViewSet.create()")
         user = request.user
         # print(type(user))
 
@@ -52,7 +72,6 @@ class SeminarViewSet(viewsets.GenericViewSet):
 
     # PUT api/v1/seminar/{seminar_id}/
     def update(self, request, pk=None):
-        print("DEBUG: SeminarViewSet.update()")
         user = request.user
         seminar = self.get_object()
 
@@ -64,42 +83,75 @@ class SeminarViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(seminar, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
 
-        participant_count = seminar.user_seminars.filter(role=UserSeminar.PARTICIPANT, is_active=True).count()
-        if data.get('capacity') and int(data.get('capacity')) < participant_count:
-            return Response({"error": "Capacity should be bigger than the number of participants"}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            capacity = serializer.validated_data.get('capacity')
+            # 조건부 UPDATE 한 번으로 동시에 join한 participant 수까지 반영해서 확인
+            if capacity is not None and not Seminar.objects.filter(
+                    pk=seminar.pk, participant_count__lte=capacity
+            ).update(capacity=capacity):
+                return Response({"error": "Capacity should be bigger than the number of participants"}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer.update(seminar, serializer.validated_data)
+            serializer.update(seminar, serializer.validated_data)
         return Response(serializer.data)
 
     # GET api/v1/seminar/{seminar_id}/
     def retrieve(self, request, pk=None):
-        print("DEBUG: SeminarViewSet.retrieve()")
-
-        seminar = self.get_object()
-        return Response(self.get_serializer(seminar).data)
+        def load():
+            # cache는 invalidate 직후에 채워지므로 replica lag이 없는 primary에서
+            with read_from(DEFAULT_DB_ALIAS):
+                seminars = list(seminar_rows(self.get_queryset().filter(pk=pk)))
+                if not seminars:
+                    raise Http404
+                user_seminars = load_user_seminars(seminars)
+            with timed('serialize'):
+                return compile_seminars(seminars, user_seminars)[0]
+
+        if not str(pk).isdigit():
+            raise Http404
+
+        # seminar/user_seminar/user 변경 때마다 바뀌는 version으로 ETag와 response cache를 함께 관리
+        seminar_id = int(pk)
+        version = get_seminar_version(seminar_id)
+        return self.conditional_response(
+            request,
+            lambda: Response(get_cached_seminar(seminar_id, version, load)),
+            version['id'],
+            version['modified'],
+        )
 
     # GET api/v1/seminar/
     def list(self, request):
-        print("DEBUG: SeminarViewSet.list()")
-
         name = request.query_params.get('name')
-        order = request.query_params.get('order')
+        search = request.query_params.get('search')
 
         seminars = self.get_queryset()
         if name:
             seminars = seminars.filter(name__icontains=name)
-
-        if order == 'earliest':
-            seminars = seminars.order_by('created_at')
-        else:
-            seminars = seminars.order_by('-created_at')
-
-        return Response(self.get_serializer(seminars, many=True).data)
+        if search:
+            seminars = search_seminars(seminars, search)
+
+        def get_response():
+            # 정렬(?order=earliest)은 SeminarCursorPagination에서, SeminarSerializer 대신 .values() row로
+            page = self.paginate_queryset(seminar_rows(seminars))
+            user_seminars = load_user_seminars(page)
+            with timed('serialize'):
+                data = compile_seminars(page, user_seminars)
+            return self.get_paginated_response(data)
+
+        # query param별 결과는 ETag의 path로 구분, table 전체 aggregate 대신 cache의 version으로
+        validators = {
+            'seminars': get_seminars_version(),
+            'users': get_user_data_version(),
+        }
+        return self.conditional_response(request, get_response, validators)
 
     # POST or DELETE api/v1/seminar/{seminar_id}/user/
     @action(detail=True, methods=['POST', 'DELETE'])
     def user(self, request, pk):
-        print("DEBUG: SeminarViewSet.user()")
+        # 꽉 찬 seminar에 대한 participant join 재시도는 drop 등으로 seminar가 바뀔 때까지 DB 없이 거절
+        if (self.request.method == 'POST' and self.request.data.get('role') == UserSeminar.PARTICIPANT
+                and not self._wants_waitlist() and is_seminar_full(pk)):
+            return Response({"error": "This seminar is already full"}, status=status.HTTP_400_BAD_REQUEST)
 
         seminar = self.get_object()
         if not seminar:
@@ -110,6 +162,74 @@ class SeminarViewSet(viewsets.GenericViewSet):
         elif self.request.method == 'DELETE':
             return self._drop_seminar(seminar)
 
+    # POST api/v1/seminar/{seminar_id}/user/bulk/
+    @action(detail=True, methods=['POST'], url_path='user/bulk')
+    def bulk_user(self, request, pk):
+        user = request.user
+        seminar = self.get_object()
+
+        if not user.user_seminars.filter(seminar=seminar, role=UserSeminar.INSTRUCTOR).exists():
+            return Response({"error": "You're not in charge of this seminar"}, status=status.HTTP_403_FORBIDDEN)
+
+        user_ids = request.data.get('user_ids')
+        if not isinstance(user_ids, list) or not all(isinstance(user_id, int) for user_id in user_ids):
+            return Response({"error": "user_ids should be a list of user ids"}, status=status.HTTP_400_BAD_REQUEST)
+        # 요청 순서대로, 중복 제거
+        user_ids = list(dict.fromkeys(user_ids))
+
+        rejected = []
+        participants = User.objects.select_related('participant').in_bulk(user_ids)
+        candidate_ids = []
+        for user_id in user_ids:
+            participant = participants.get(user_id)
+            if not participant:
+                rejected.append({"id": user_id, "error": "User does not exist"})
+            elif not hasattr(participant, UserSeminar.PARTICIPANT):
+                rejected.append({"id": user_id, "error": "User is not a participant"})
+            elif not participant.participant.accepted:
+                rejected.append({"id": user_id, "error": "User is not accepted"})
+            else:
+                candidate_ids.append(user_id)
+
+        try:
+            with transaction.atomic():
+                # seminar row 하나만 lock하고 정원 확인은 한 번
+                seminar = Seminar.objects.select_for_update().get(pk=seminar.pk)
+
+                joined_ids = set(seminar.user_seminars.filter(user_id__in=candidate_ids).values_list('user_id', flat=True))
+                rejected += [
+                    {"id": user_id, "error": "User has already joined this seminar"}
+                    for user_id in candidate_ids if user_id in joined_ids
+                ]
+                candidate_ids = [user_id for user_id in candidate_ids if user_id not in joined_ids]
+
+                available = max(seminar.capacity - seminar.participant_count, 0)
+                enrolled_ids = candidate_ids[:available]
+                rejected += [{"id": user_id, "error": "This seminar is already full"} for user_id in candidate_ids[available:]]
+
+                if enrolled_ids:
+                    Seminar.objects.filter(pk=seminar.pk).update(participant_count=F('participant_count') + len(enrolled_ids))
+                    UserSeminar.objects.bulk_create([
+                        UserSeminar(user_id=user_id, seminar=seminar, role=UserSeminar.PARTICIPANT)
+                        for user_id in enrolled_ids
+                    ])
+                    # bulk_create는 post_save를 보내지 않음
+                    invalidate_seminar(seminar.pk)
+        except IntegrityError:
+            # 같은 user의 join이 동시에 들어온 경우 전체 rollback
+            return Response({"error": "Some users joined this seminar concurrently, please retry"}, status=status.HTTP_409_CONFLICT)
+
+        seminar.refresh_from_db()
+        return Response({
+            "seminar": self.get_serializer(seminar).data,
+            "enrolled": enrolled_ids,
+            "rejected": rejected,
+        }, status=status.HTTP_201_CREATED)
+
+    def _wants_waitlist(self):
+        # {"waitlist": true}: 정원이 찼으면 400 대신 대기열에
+        return self.request.data.get('waitlist') in (True, 'true', 'True')
+
     def _join_seminar(self, seminar):
         user = self.request.user
         role = self.request.data.get('role')
@@ -126,19 +246,39 @@ class SeminarViewSet(viewsets.GenericViewSet):
             if not user.participant.accepted:
                 return Response({"error": "You're not accepted"}, status=status.HTTP_403_FORBIDDEN)
 
-            with transaction.atomic():
-                # 동시에 수행
-                participant_count = seminar.user_seminars.select_for_update().filter(
-                    role=UserSeminar.PARTICIPANT, is_active=True
-                ).count()
-                if participant_count >= seminar.capacity:
-                    return Response({"error": "This seminar is already full"}, status=status.HTTP_400_BAD_REQUEST)
-
-                UserSeminar.objects.create(
-                    user=user,
-                    seminar=seminar,
-                    role=UserSeminar.PARTICIPANT
-                )
+            waitlist = self._wants_waitlist()
+            if waitlist and user.waitlist_entries.filter(seminar=seminar).exists():
+                return Response({"error": "You're already on the waitlist of this seminar"}, status=status.HTTP_400_BAD_REQUEST)
+
+            version = get_seminar_version(seminar.pk)
+            try:
+                with transaction.atomic():
+                    # 정원 확인과 증가를 조건부 UPDATE 한 번으로 (seminar row만 잠깐 lock)
+                    if not Seminar.objects.filter(
+                            pk=seminar.pk, participant_count__lt=F('capacity')
+                    ).update(participant_count=F('participant_count') + 1):
+                        if not waitlist:
+                            mark_seminar_full(seminar.pk, version)
+                            return Response({"error": "This seminar is already full"}, status=status.HTTP_400_BAD_REQUEST)
+
+                        # seminar row를 lock하고 다시 확인, 그 사이 drop으로 자리가 났으면 그대로 join
+                        locked = Seminar.objects.select_for_update().get(pk=seminar.pk)
+                        if locked.participant_count >= locked.capacity:
+                            entry = WaitlistEntry.objects.create(user=user, seminar=seminar)
+                            return Response(
+                                {"waitlist": {"seminar": seminar.pk, "position": waitlist_position(entry)}},
+                                status=status.HTTP_202_ACCEPTED
+                            )
+                        Seminar.objects.filter(pk=seminar.pk).update(participant_count=F('participant_count') + 1)
+
+                    UserSeminar.objects.create(
+                        user=user,
+                        seminar=seminar,
+                        role=UserSeminar.PARTICIPANT
+                    )
+            except IntegrityError:
+                # 같은 user의 join이 동시에 들어온 경우, 증가분도 함께 rollback
+                return Response({"error": "You've joined this seminar"}, status=status.HTTP_400_BAD_REQUEST)
 
         elif role == UserSeminar.INSTRUCTOR:
             if not hasattr(user, UserSeminar.INSTRUCTOR):
@@ -156,7 +296,7 @@ class SeminarViewSet(viewsets.GenericViewSet):
 
     def _drop_seminar(self, seminar):
         user = self.request.user
-        role = self.request.get('role')
+        role = self.request.data.get('role')
 
         if role not in UserSeminar.ROLES:
             return Response({"error": "Role should be either participant or instructor"}, status=status.HTTP_400_BAD_REQUEST)
@@ -164,12 +304,22 @@ class SeminarViewSet(viewsets.GenericViewSet):
         if role == UserSeminar.INSTRUCTOR:
             return Response({"error": "Instructor cannot drop the seminar"}, status=status.HTTP_403_FORBIDDEN)
 
-        user_seminar = user.user_seminars.filter(seminar=seminar).last()
-
-        if user_seminar and user_seminar.is_active:
-            user_seminar.dropped_at = timezone.now()
-            user_seminar.is_active = False
-            user_seminar.save()
+        with transaction.atomic():
+            # 자기 UserSeminar row만 lock
+            user_seminar = user.user_seminars.select_for_update().filter(seminar=seminar).last()
+
+            if user_seminar and user_seminar.is_active:
+                user_seminar.dropped_at = timezone.now()
+                user_seminar.is_active = False
+                user_seminar.save()
+
+                if user_seminar.role == UserSeminar.PARTICIPANT:
+                    Seminar.objects.filter(pk=seminar.pk).update(participant_count=F('participant_count') - 1)
+                    # 빈 자리는 같은 transaction에서 대기열의 다음 user에게 (나머지는 process_waitlist)
+                    promote_waiters(seminar.pk, limit=1)
+            elif not user_seminar:
+                # 대기 중이었으면 대기 취소
+                user.waitlist_entries.filter(seminar=seminar).delete()
 
         seminar.refresh_from_db()
         return Response(self.get_serializer(seminar).data)
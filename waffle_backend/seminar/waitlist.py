@@ -0,0 +1,58 @@
+from django.db.models import F
+
+from seminar.cache import invalidate_seminar
+from seminar.models import Seminar, UserSeminar, WaitlistEntry
+from user.models import ParticipantProfile
+from waffle_backend.metrics import registry
+
+
+def waitlist_position(entry):
+    # 1부터
+    return WaitlistEntry.objects.filter(seminar_id=entry.seminar_id, id__lte=entry.id).count()
+
+
+def promote_waiters(seminar_id, limit=None):
+    # 호출하는 쪽의 transaction 안에서: seminar row를 lock하고 빈 자리만큼 대기열 앞에서부터 participant로
+    # 그 사이 다른 경로로 join했거나 accepted가 아니게 된 user는 건너뛰고 대기열에서 제거
+    seminar = Seminar.objects.select_for_update().get(pk=seminar_id)
+    available = seminar.capacity - seminar.participant_count
+    if limit is not None:
+        available = min(available, limit)
+
+    promoted_ids = []
+    while available > 0:
+        # locking read: 이 transaction이 시작된 뒤 commit된 대기도 보이도록
+        entries = list(WaitlistEntry.objects.select_for_update().filter(seminar_id=seminar_id).order_by('id')[:available])
+        if not entries:
+            break
+
+        user_ids = [entry.user_id for entry in entries]
+        joined_ids = set(UserSeminar.objects.filter(seminar_id=seminar_id, user_id__in=user_ids)
+                         .values_list('user_id', flat=True))
+        accepted_ids = set(ParticipantProfile.objects.filter(user_id__in=user_ids, accepted=True)
+                           .values_list('user_id', flat=True))
+        user_ids = [user_id for user_id in user_ids if user_id in accepted_ids and user_id not in joined_ids]
+
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        if user_ids:
+            Seminar.objects.filter(pk=seminar_id).update(participant_count=F('participant_count') + len(user_ids))
+            UserSeminar.objects.bulk_create([
+                UserSeminar(user_id=user_id, seminar_id=seminar_id, role=UserSeminar.PARTICIPANT)
+                for user_id in user_ids
+            ])
+            promoted_ids += user_ids
+            available -= len(user_ids)
+
+    if promoted_ids:
+        # bulk_create는 post_save를 보내지 않음
+        invalidate_seminar(seminar_id)
+        registry.incr('waitlist.promoted', len(promoted_ids))
+    return promoted_ids
+
+
+def seminars_to_promote(limit):
+    # 대기자가 있는데 자리가 남은 seminar (drop과 대기가 엇갈린 경우, 정원이 늘어난 경우 등)
+    return list(
+        WaitlistEntry.objects.filter(seminar__participant_count__lt=F('seminar__capacity'))
+        .order_by('seminar_id').values_list('seminar_id', flat=True).distinct()[:limit]
+    )
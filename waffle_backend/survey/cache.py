@@ -0,0 +1,100 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from survey.models import OperatingSystem
+
+OS_CATALOG_KEY = 'survey:os_catalog'
+OS_CATALOG_VERSION_KEY = 'survey:os_catalog:version'
+# SurveyResult가 추가/변경/삭제될 때마다 바뀌는 version (survey list의 ETag)
+SURVEY_VERSION_KEY = 'survey:version'
+
+# process-local copy (version, catalog, 확인한 시각)
+# OS_CATALOG_LOCAL_TIMEOUT초 동안은 shared cache의 version을 다시 확인하지 않음 -> row마다 cache 왕복하지 않도록
+_local_catalog = (None, None, 0)
+
+
+def _load_os_catalog():
+    by_id = {}
+    by_name = {}
+    # 새 version으로 cache되므로 replica lag이 없는 primary에서
+    operating_systems = OperatingSystem.objects.using(DEFAULT_DB_ALIAS).order_by('id')
+    for operating_system in operating_systems.values('id', 'name', 'description', 'price'):
+        by_id[operating_system['id']] = operating_system
+        # name은 unique가 아니므로 먼저 만들어진 OS 기준
+        by_name.setdefault(operating_system['name'], operating_system['id'])
+    return {'by_id': by_id, 'by_name': by_name}
+
+
+def get_os_catalog_version():
+    return cache.get_or_set(OS_CATALOG_VERSION_KEY, lambda: uuid4().hex, None)
+
+
+def get_os_catalog():
+    global _local_catalog
+
+    now = time.monotonic()
+    local_version, catalog, checked_at = _local_catalog
+    if catalog is not None and now - checked_at < settings.OS_CATALOG_LOCAL_TIMEOUT:
+        return catalog
+
+    version = get_os_catalog_version()
+    if local_version == version:
+        _local_catalog = (version, catalog, now)
+        return catalog
+
+    # catalog는 version별 key에 저장 -> invalidate 도중에 load된 catalog가 새 version으로 읽히지 않음
+    catalog_key = f'{OS_CATALOG_KEY}:{version}'
+    catalog = cache.get(catalog_key)
+    if catalog is None:
+        catalog = _load_os_catalog()
+        cache.set(catalog_key, catalog, settings.OS_CATALOG_TIMEOUT)
+
+    _local_catalog = (version, catalog, now)
+    return catalog
+
+
+def _rotate_os_catalog_version():
+    global _local_catalog
+
+    cache.set(OS_CATALOG_VERSION_KEY, uuid4().hex, None)
+    _local_catalog = (None, None, 0)
+
+
+def invalidate_os_catalog():
+    _rotate_os_catalog_version()
+    # commit 전에 다른 request가 이전 data를 새 version으로 cache했을 수 있으므로 commit 후 한 번 더
+    transaction.on_commit(_rotate_os_catalog_version)
+
+
+def get_operating_systems():
+    return list(get_os_catalog()['by_id'].values())
+
+
+def get_operating_system(pk):
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    return get_os_catalog()['by_id'].get(pk)
+
+
+def get_os_id(name):
+    return get_os_catalog()['by_name'].get(name)
+
+
+def get_survey_version():
+    return cache.get_or_set(SURVEY_VERSION_KEY, lambda: uuid4().hex, None)
+
+
+def _rotate_survey_version():
+    cache.set(SURVEY_VERSION_KEY, uuid4().hex, None)
+
+
+def invalidate_surveys():
+    _rotate_survey_version()
+    # commit 전에 다른 request가 이전 결과에 새 version의 ETag를 붙였을 수 있으므로 commit 후 한 번 더
+    transaction.on_commit(_rotate_survey_version)
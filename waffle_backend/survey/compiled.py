@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from survey.cache import get_operating_system
+from survey.models import OperatingSystem
+
+# SurveyResultSerializer(expand 없음)와 같은 결과를 .values() row에서 바로 (read 전용)
+SURVEY_FIELDS = (
+    'id', 'os_id', 'user_id', 'python', 'rdb', 'programming', 'major', 'grade', 'backend_reason', 'waffle_reason',
+    'say_something', 'timestamp',
+)
+
+_datetime = serializers.DateTimeField().to_representation
+
+
+def survey_rows(queryset):
+    return queryset.values(*SURVEY_FIELDS)
+
+
+def _operating_system(os_id):
+    if not os_id:
+        return None
+    operating_system = get_operating_system(os_id)
+    if operating_system is None:
+        # catalog invalidate 직후 등
+        operating_system = OperatingSystem.objects.filter(pk=os_id).values('id', 'name', 'description', 'price').first()
+    return operating_system
+
+
+def compile_surveys(surveys, fields=None):
+    data = []
+    for survey in surveys:
+        row = {
+            'id': survey['id'],
+            'os': _operating_system(survey['os_id']),
+            'user': survey['user_id'],
+            'python': survey['python'],
+            'rdb': survey['rdb'],
+            'programming': survey['programming'],
+            'major': survey['major'],
+            'grade': survey['grade'],
+            'backend_reason': survey['backend_reason'],
+            'waffle_reason': survey['waffle_reason'],
+            'say_something': survey['say_something'],
+            'timestamp': _datetime(survey['timestamp']),
+        }
+        if fields:
+            row = {name: value for name, value in row.items() if name in fields}
+        data.append(row)
+    return data
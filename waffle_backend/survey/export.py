@@ -0,0 +1,72 @@
+import csv
+import json
+
+from survey.cache import get_operating_system
+from survey.models import SurveyResult
+
+EXPORT_FIELDS = (
+    'id',
+    'os_id',
+    'user_id',
+    'python',
+    'rdb',
+    'programming',
+    'major',
+    'grade',
+    'backend_reason',
+    'waffle_reason',
+    'say_something',
+    'timestamp',
+)
+EXPORT_COLUMNS = ('id', 'os', 'user_id') + EXPORT_FIELDS[3:]
+DEFAULT_CHUNK_SIZE = 1000
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def iter_survey_rows(since=None, chunk_size=DEFAULT_CHUNK_SIZE, using=None):
+    # id 기준 keyset으로 chunk씩 -> MySQL처럼 server-side cursor가 없는 DB에서도 memory 사용량 일정
+    surveys = SurveyResult.objects.using(using).order_by('id').values(*EXPORT_FIELDS)
+    if since:
+        surveys = surveys.filter(timestamp__gt=since)
+
+    last_id = 0
+    while True:
+        rows = list(surveys.filter(id__gt=last_id)[:chunk_size])
+        if not rows:
+            return
+        for row in rows:
+            os_id = row.pop('os_id')
+            operating_system = get_operating_system(os_id) if os_id else None
+            row['os'] = operating_system['name'] if operating_system else None
+            row['timestamp'] = row['timestamp'].isoformat()
+            yield row
+        last_id = rows[-1]['id']
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps({column: row[column] for column in EXPORT_COLUMNS}, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    # csv.writer가 쓴 한 줄을 그대로 돌려줌
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([row[column] for column in EXPORT_COLUMNS])
+
+
+def iter_export(export_type, since=None, chunk_size=DEFAULT_CHUNK_SIZE, using=None):
+    rows = iter_survey_rows(since, chunk_size, using)
+    if export_type == 'csv':
+        return iter_csv(rows)
+    return iter_ndjson(rows)
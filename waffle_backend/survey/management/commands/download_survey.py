@@ -1,12 +1,74 @@
-from django.core.management.base import BaseCommand
+import hashlib
+from collections import Counter
 
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from survey.cache import invalidate_surveys
 from survey.models import OperatingSystem, SurveyResult
+from survey.stats import update_survey_statistics
+
+DEFAULT_BATCH_SIZE = 1000
+# 동시에 같은 파일을 import해서 unique 충돌이 나면 이미 들어간 row를 다시 확인 후 재시도
+MAX_ATTEMPTS = 3
+
+
+def _content_hash(line, occurrence):
+    # 같은 내용의 row가 파일에 여러 번 있을 수 있으므로 몇 번째 등장인지까지 hash에 포함
+    return hashlib.sha256(f'{occurrence}\t{line}'.encode('utf-8')).hexdigest()
+
+
+def _read_rows(tsv_file):
+    occurrences = Counter()
+    with open(tsv_file, encoding='utf-8') as f:
+        for idx, line in enumerate(f, start=1):
+            if idx < 2:
+                continue
+
+            line = line.rstrip('\r\n')
+            if not line.strip():
+                continue
 
+            occurrences[line] += 1
+            yield _content_hash(line, occurrences[line]), line.split('\t')
 
-def download_survey():
-    # NOTE: if you run this command multiple times, rows of 'survey_surveyresult' table will be added repeatedly.
 
-    path = '.'  # NOTE: you should assign proper directory path
+def _import_batch(batch, os_ids):
+    for content_hash, data in batch:
+        os_name = data[1]
+        if os_name not in os_ids:
+            os_ids[os_name] = OperatingSystem.objects.get_or_create(name=os_name)[0].id
+
+    hashes = [content_hash for content_hash, data in batch]
+    for _ in range(MAX_ATTEMPTS):
+        existing = set(SurveyResult.objects.filter(content_hash__in=hashes).values_list('content_hash', flat=True))
+        surveys = [
+            SurveyResult(timestamp=data[0], os_id=os_ids[data[1]], python=int(data[2]), rdb=int(data[3]),
+                         programming=int(data[4]), major=data[5], grade=data[6],
+                         backend_reason=data[7], waffle_reason=data[8], say_something=data[9],
+                         content_hash=content_hash)
+            for content_hash, data in batch if content_hash not in existing
+        ]
+        if not surveys:
+            return 0
+
+        try:
+            with transaction.atomic():
+                # 충돌을 무시하지 않음 -> 통계와 created 수에는 실제로 insert된 row만
+                SurveyResult.objects.bulk_create(surveys)
+                # bulk_create는 post_save를 보내지 않으므로 직접 갱신
+                update_survey_statistics(surveys)
+                invalidate_surveys()
+            return len(surveys)
+        except IntegrityError:
+            continue
+
+    raise CommandError('Survey results kept conflicting with a concurrent import, please retry')
+
+
+def download_survey(path='.', batch_size=DEFAULT_BATCH_SIZE):
+    # NOTE: rows that were already imported are skipped, so this command can be run repeatedly.
+
     if not path:
         raise Exception("Please specify path of directory including 'example_surveyresult.tsv'!")
     tsv_file = f"{path}/example_surveyresult.tsv"
@@ -15,20 +77,37 @@ def download_survey():
     OperatingSystem.objects.get_or_create(name='MacOS', price=300000, description="Most favorite OS of Seminar Instructors")
     OperatingSystem.objects.get_or_create(name='Linux', price=0, description="Linus Benedict Torvalds")
 
-    with open(tsv_file) as f:
-        for idx, line in enumerate(f, start=1):
-            if idx < 2:
-                continue
+    # name -> id, 이후 row마다 OperatingSystem을 조회하지 않음
+    os_ids = dict(OperatingSystem.objects.values_list('name', 'id'))
 
-            data = line.split('\t')
+    created_count = 0
+    total_count = 0
+    batch = []
+    for row in _read_rows(tsv_file):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            created_count += _import_batch(batch, os_ids)
+            total_count += len(batch)
+            batch = []
+    if batch:
+        created_count += _import_batch(batch, os_ids)
+        total_count += len(batch)
 
-            operating_system, created = OperatingSystem.objects.get_or_create(name=data[1])
-            SurveyResult.objects.create(timestamp=data[0], os=operating_system, python=int(data[2]), rdb=int(data[3]),
-                                        programming=int(data[4]), major=data[5], grade=data[6],
-                                        backend_reason=data[7], waffle_reason=data[8], say_something=data[9])
+    return created_count, total_count
 
 
 class Command(BaseCommand):
+    help = "Import survey results from 'example_surveyresult.tsv' in the given directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='.',
+                            help="Directory including 'example_surveyresult.tsv'")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Number of rows inserted per bulk_create')
 
     def handle(self, *args, **options):
-        download_survey()
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size should be a positive number')
+
+        created_count, total_count = download_survey(options['path'], options['batch_size'])
+        self.stdout.write(f'Imported {created_count} survey results ({total_count - created_count} already existed)')
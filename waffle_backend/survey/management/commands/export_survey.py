@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from survey.export import CONTENT_TYPES, DEFAULT_CHUNK_SIZE, iter_export
+
+
+class Command(BaseCommand):
+    help = 'Stream survey results as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=list(CONTENT_TYPES), default='ndjson', help='Export format')
+        parser.add_argument('--since', help='Only export survey results after this ISO 8601 datetime')
+        parser.add_argument('--output', help='Output file path (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Number of rows fetched per query')
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since:
+            since = parse_datetime(since)
+            if since is None:
+                raise CommandError('--since should be an ISO 8601 datetime')
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size should be a positive number')
+
+        lines = iter_export(options['type'], since, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                f.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
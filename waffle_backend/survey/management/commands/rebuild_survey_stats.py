@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from survey.stats import rebuild_survey_statistics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the SurveyStatistic summary table from survey results'
+
+    def handle(self, *args, **options):
+        row_count = rebuild_survey_statistics()
+        self.stdout.write(f'Rebuilt {row_count} survey statistic rows')
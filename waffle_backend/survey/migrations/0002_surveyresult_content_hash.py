@@ -0,0 +1,18 @@
+# Generated by Django 3.1.13 on 2026-10-17 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveyresult',
+            name='content_hash',
+            field=models.CharField(max_length=64, null=True, unique=True),
+        ),
+    ]
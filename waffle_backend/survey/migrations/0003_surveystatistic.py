@@ -0,0 +1,43 @@
+# Generated by Django 3.1.13 on 2026-10-17 02:51
+
+from django.db import migrations, models
+
+
+def fill_survey_statistics(apps, schema_editor):
+    SurveyResult = apps.get_model('survey', 'SurveyResult')
+    SurveyStatistic = apps.get_model('survey', 'SurveyStatistic')
+
+    statistics = []
+    for group, field in (('os', 'os_id'), ('major', 'major')):
+        for subject in ('python', 'rdb', 'programming'):
+            rows = SurveyResult.objects.order_by().values(field, subject).annotate(count=models.Count('id'))
+            for row in rows:
+                statistics.append(SurveyStatistic(
+                    group=group, key=str(row[field] or ''), subject=subject, degree=row[subject], count=row['count']
+                ))
+    SurveyStatistic.objects.bulk_create(statistics)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey', '0002_surveyresult_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyStatistic',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(choices=[('os', 'os'), ('major', 'major')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('subject', models.CharField(choices=[('python', 'python'), ('rdb', 'rdb'), ('programming', 'programming')], max_length=20)),
+                ('degree', models.PositiveSmallIntegerField(choices=[(1, 'very low'), (2, 'low'), (3, 'middle'), (4, 'high'), (5, 'very_high')])),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('group', 'key', 'subject', 'degree')},
+            },
+        ),
+        migrations.RunPython(fill_survey_statistics, migrations.RunPython.noop),
+    ]
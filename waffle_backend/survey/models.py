@@ -28,3 +28,31 @@ class SurveyResult(models.Model):
     waffle_reason = models.CharField(max_length=500, blank=True)
     say_something = models.CharField(max_length=500, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
+
+    # download_survey로 import된 row의 dedup key (API로 생성된 row는 NULL)
+    content_hash = models.CharField(max_length=64, null=True, unique=True)
+
+
+class SurveyStatistic(models.Model):
+    # SurveyResult insert/delete마다 incremental하게 갱신되는 materialized histogram
+    GROUP_OS = 'os'
+    GROUP_MAJOR = 'major'
+
+    GROUP_CHOICES = [
+        (GROUP_OS, GROUP_OS),
+        (GROUP_MAJOR, GROUP_MAJOR),
+    ]
+
+    SUBJECTS = ('python', 'rdb', 'programming')
+
+    group = models.CharField(max_length=20, choices=GROUP_CHOICES)
+    # os: OperatingSystem id (없으면 ''), major: SurveyResult.major
+    key = models.CharField(max_length=100)
+    subject = models.CharField(max_length=20, choices=[(subject, subject) for subject in SUBJECTS])
+    degree = models.PositiveSmallIntegerField(choices=SurveyResult.EXPERIENCE_DEGREE)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (
+            ('group', 'key', 'subject', 'degree')
+        )
@@ -0,0 +1,9 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class SurveyResultCursorPagination(CursorPagination):
+    ordering = ('timestamp', 'id')
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
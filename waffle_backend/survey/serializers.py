@@ -1,5 +1,8 @@
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from survey.cache import get_operating_system, get_os_id
 from survey.models import OperatingSystem, SurveyResult
 from user.serializers import UserSerializer
 
@@ -28,19 +31,49 @@ class SurveyResultSerializer(serializers.ModelSerializer):
             'os_name',
         )
 
+    EXPANDABLE_FIELDS = ('user', )
+
+    def __init__(self, *args, **kwargs):
+        super(SurveyResultSerializer, self).__init__(*args, **kwargs)
+
+        # context['fields']: ?fields=로 고른 read field만 남김 (write_only는 유지)
+        fields = self.context.get('fields')
+        if fields:
+            for name in list(self.fields):
+                if name not in fields and not self.fields[name].write_only:
+                    self.fields.pop(name)
+
+    @staticmethod
+    def setup_eager_loading(queryset, expand=()):
+        if 'user' in expand:
+            # 펼친 user의 profile, seminar들도 survey 수와 관계없이 한 번에
+            queryset = queryset.prefetch_related(
+                Prefetch('user', queryset=UserSerializer.setup_eager_loading(User.objects.all()))
+            )
+        return queryset
+
     def get_os(self, survey):
-        if survey.os:
+        if survey.os_id:
+            operating_system = get_operating_system(survey.os_id)
+            if operating_system:
+                return operating_system
             return OperatingSystemSerializer(survey.os, context=self.context).data
         return None
 
     def get_user(self, survey):
+        # context['expand']에 user가 없으면 id만
+        if 'user' not in self.context.get('expand', ()):
+            return survey.user_id
         if survey.user:
             return UserSerializer(survey.user, context=self.context).data
         return None
 
     def create(self, validated_data):
-        os, created = OperatingSystem.objects.get_or_create(name=validated_data.pop('os_name'))
-        validated_data['os'] = os
+        os_name = validated_data.pop('os_name')
+        os_id = get_os_id(os_name)
+        if os_id is None:
+            os_id = OperatingSystem.objects.get_or_create(name=os_name)[0].id
+        validated_data['os_id'] = os_id
         validated_data['user'] = self.context['request'].user
         return super(SurveyResultSerializer, self).create(validated_data)
 
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from survey.cache import invalidate_os_catalog, invalidate_surveys
+from survey.models import OperatingSystem, SurveyResult
+from survey.stats import forget_operating_system, replace_survey_statistics, update_survey_statistics
+
+
+@receiver(post_save, sender=OperatingSystem)
+@receiver(post_delete, sender=OperatingSystem)
+def invalidate_os_catalog_on_change(sender, **kwargs):
+    invalidate_os_catalog()
+
+
+@receiver(post_delete, sender=OperatingSystem)
+def forget_operating_system_statistics(sender, instance, **kwargs):
+    forget_operating_system(instance.pk)
+
+
+@receiver(pre_save, sender=SurveyResult)
+def remember_survey_statistics(sender, instance, raw, **kwargs):
+    # 수정 전 값을 알아야 statistics에서 뺄 수 있음
+    if not raw and not instance._state.adding:
+        instance._previous_survey = SurveyResult.objects.filter(pk=instance.pk).first()
+
+
+@receiver(post_save, sender=SurveyResult)
+def add_survey_statistics(sender, instance, created, **kwargs):
+    if created:
+        update_survey_statistics([instance])
+        return
+
+    previous = instance.__dict__.pop('_previous_survey', None)
+    if previous is not None:
+        replace_survey_statistics(previous, instance)
+
+
+@receiver(post_delete, sender=SurveyResult)
+def remove_survey_statistics(sender, instance, **kwargs):
+    update_survey_statistics([instance], delta=-1)
+
+
+@receiver(post_save, sender=SurveyResult)
+@receiver(post_delete, sender=SurveyResult)
+def invalidate_surveys_on_change(sender, **kwargs):
+    invalidate_surveys()
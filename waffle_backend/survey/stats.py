@@ -0,0 +1,129 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from survey.cache import get_operating_system
+from survey.models import SurveyResult, SurveyStatistic
+
+
+def _group_keys(survey):
+    return (
+        (SurveyStatistic.GROUP_OS, str(survey.os_id or '')),
+        (SurveyStatistic.GROUP_MAJOR, survey.major),
+    )
+
+
+def _count_surveys(increments, surveys, delta):
+    for survey in surveys:
+        for group, key in _group_keys(survey):
+            for subject in SurveyStatistic.SUBJECTS:
+                increments[(group, key, subject, getattr(survey, subject))] += delta
+
+
+def _apply_increments(increments):
+    for (group, key, subject, degree), increment in increments.items():
+        if not increment:
+            continue
+        statistics = SurveyStatistic.objects.filter(group=group, key=key, subject=subject, degree=degree)
+        if statistics.update(count=F('count') + increment) or increment < 0:
+            continue
+        try:
+            with transaction.atomic():
+                SurveyStatistic.objects.create(group=group, key=key, subject=subject, degree=degree, count=increment)
+        except IntegrityError:
+            # 다른 request가 먼저 row를 만든 경우
+            statistics.update(count=F('count') + increment)
+
+
+@transaction.atomic
+def update_survey_statistics(surveys, delta=1):
+    # 같은 (group, key, subject, degree)끼리 합쳐서 row당 UPDATE 한 번
+    increments = Counter()
+    _count_surveys(increments, surveys, delta)
+    _apply_increments(increments)
+
+
+@transaction.atomic
+def replace_survey_statistics(previous, survey):
+    # 수정된 survey: 바뀌지 않은 (group, key, subject, degree)는 상쇄되어 UPDATE하지 않음
+    increments = Counter()
+    _count_surveys(increments, [previous], -1)
+    _count_surveys(increments, [survey], 1)
+    _apply_increments(increments)
+
+
+@transaction.atomic
+def forget_operating_system(os_id):
+    # OperatingSystem 삭제 시 SET_NULL은 signal 없이 UPDATE되므로 count를 unknown('') key로 옮김
+    statistics = SurveyStatistic.objects.filter(group=SurveyStatistic.GROUP_OS, key=str(os_id))
+    increments = Counter()
+    for subject, degree, count in statistics.values_list('subject', 'degree', 'count'):
+        increments[(SurveyStatistic.GROUP_OS, '', subject, degree)] += count
+    statistics.delete()
+    _apply_increments(increments)
+
+
+@transaction.atomic
+def rebuild_survey_statistics():
+    statistics = []
+    for group, field in ((SurveyStatistic.GROUP_OS, 'os_id'), (SurveyStatistic.GROUP_MAJOR, 'major')):
+        for subject in SurveyStatistic.SUBJECTS:
+            rows = SurveyResult.objects.order_by().values(field, subject).annotate(count=Count('id'))
+            for row in rows:
+                statistics.append(SurveyStatistic(
+                    group=group, key=str(row[field] or ''), subject=subject, degree=row[subject], count=row['count']
+                ))
+
+    SurveyStatistic.objects.all().delete()
+    SurveyStatistic.objects.bulk_create(statistics)
+    return len(statistics)
+
+
+def _summarize(histogram):
+    total = sum(histogram.values())
+    return {
+        'histogram': {str(degree): histogram.get(degree, 0) for degree, label in SurveyResult.EXPERIENCE_DEGREE},
+        'mean': round(sum(degree * count for degree, count in histogram.items()) / total, 3) if total else None,
+    }
+
+
+def _summarize_group(histograms):
+    return {
+        'count': sum(histograms[SurveyStatistic.SUBJECTS[0]].values()),
+        **{subject: _summarize(histograms[subject]) for subject in SurveyStatistic.SUBJECTS},
+    }
+
+
+def get_survey_statistics():
+    groups = {SurveyStatistic.GROUP_OS: {}, SurveyStatistic.GROUP_MAJOR: {}}
+    rows = SurveyStatistic.objects.filter(count__gt=0).values_list('group', 'key', 'subject', 'degree', 'count')
+    for group, key, subject, degree, count in rows:
+        histograms = groups[group].setdefault(key, {subject: Counter() for subject in SurveyStatistic.SUBJECTS})
+        histograms[subject][degree] += count
+
+    # 모든 survey는 os group에 정확히 한 번씩 포함됨
+    overall = {subject: Counter() for subject in SurveyStatistic.SUBJECTS}
+    for histograms in groups[SurveyStatistic.GROUP_OS].values():
+        for subject in SurveyStatistic.SUBJECTS:
+            overall[subject].update(histograms[subject])
+
+    by_os = []
+    for key, histograms in groups[SurveyStatistic.GROUP_OS].items():
+        operating_system = get_operating_system(key) if key else None
+        by_os.append({
+            'id': operating_system['id'] if operating_system else None,
+            'name': operating_system['name'] if operating_system else None,
+            **_summarize_group(histograms),
+        })
+
+    by_major = [
+        {'major': key, **_summarize_group(histograms)}
+        for key, histograms in sorted(groups[SurveyStatistic.GROUP_MAJOR].items())
+    ]
+
+    return {
+        **_summarize_group(overall),
+        'os': sorted(by_os, key=lambda row: (row['id'] is None, row['id'] or 0)),
+        'major': by_major,
+    }
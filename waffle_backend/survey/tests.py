@@ -1,3 +1,397 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+
+from survey import cache as survey_cache
+from survey.compiled import compile_surveys, survey_rows
+from survey.models import OperatingSystem, SurveyResult, SurveyStatistic
+from survey.serializers import SurveyResultSerializer
+from waffle_backend.renderers import FastJSONRenderer
+
+SURVEY_HEADER = '타임스탬프\t운영체제\tpython\trdb\tprogramming\t전공\t학년\tbackend\twaffle\tsay\r\n'
+
+
+class DownloadSurveyTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _write_tsv(self, *rows):
+        with open(os.path.join(self.directory.name, 'example_surveyresult.tsv'), 'w', encoding='utf-8') as f:
+            f.write(SURVEY_HEADER)
+            for row in rows:
+                f.write(row + '\r\n')
+
+    def _download(self):
+        call_command('download_survey', self.directory.name, '--batch-size', '2', stdout=StringIO())
+
+    def test_download_survey_is_incremental(self):
+        row = '2020-08-25 22:04:25\tWindows\t3\t1\t3\t컴퓨터공학부\t2학년\t\t\t'
+        self._write_tsv(row, row, '2020-08-25 22:04:26\tUbuntu\t4\t2\t5\t경영학과\t1학년\t\t\t')
+        self._download()
+        self.assertEqual(SurveyResult.objects.count(), 3)
+        self.assertEqual(SurveyResult.objects.filter(os__name='Ubuntu').count(), 1)
+
+        self._download()
+        self.assertEqual(SurveyResult.objects.count(), 3)
+
+        self._write_tsv(row, row, '2020-08-25 22:04:26\tUbuntu\t4\t2\t5\t경영학과\t1학년\t\t\t', row)
+        self._download()
+        self.assertEqual(SurveyResult.objects.count(), 4)
+        self.assertEqual(OperatingSystem.objects.filter(name='Windows').count(), 1)
+        self.assertEqual(SurveyResult.objects.filter(say_something='').count(), 4)
+
+    def test_download_survey_concurrent_import(self):
+        row = '2020-08-25 22:04:25\tWindows\t3\t1\t3\t컴퓨터공학부\t2학년\t\t\t'
+        self._write_tsv(row)
+        self._download()
+
+        # 다른 import가 첫 row를 먼저 넣은 뒤라 이미 있는 row 확인에서 빠진 경우
+        self._write_tsv(row, '2020-08-25 22:04:26\tUbuntu\t4\t2\t5\t경영학과\t1학년\t\t\t')
+        filter = SurveyResult.objects.filter
+        stale_filters = [SurveyResult.objects.none()]
+        with mock.patch.object(SurveyResult.objects, 'filter',
+                               side_effect=lambda *args, **kwargs: stale_filters.pop() if stale_filters
+                               else filter(*args, **kwargs)):
+            stdout = StringIO()
+            call_command('download_survey', self.directory.name, stdout=stdout)
+
+        self.assertIn('Imported 1 survey results', stdout.getvalue())
+        self.assertEqual(SurveyResult.objects.count(), 2)
+        python_counts = SurveyStatistic.objects.filter(group=SurveyStatistic.GROUP_OS, subject='python')
+        self.assertEqual(sum(python_counts.values_list('count', flat=True)), 2)
+
+
+class OperatingSystemCatalogTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.windows = OperatingSystem.objects.create(name='Windows', price=200000)
+        user = User.objects.create_user(username='surveyor', password='password')
+        self.token = 'Token ' + Token.objects.create(user=user).key
+
+    def test_get_os_from_cache(self):
+        self.client.get('/api/v1/os/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/os/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([os['name'] for os in response.json()], ['Windows'])
+
+            response = self.client.get(f'/api/v1/os/{self.windows.id}/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['price'], 200000)
+
+            response = self.client.get('/api/v1/os/999/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        OperatingSystem.objects.create(name='Linux', price=0)
+        response = self.client.get('/api/v1/os/')
+        self.assertEqual([os['name'] for os in response.json()], ['Windows', 'Linux'])
+
+        windows_id = self.windows.id
+        self.windows.delete()
+        response = self.client.get(f'/api/v1/os/{windows_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_os_from_local_catalog(self):
+        survey_cache.get_operating_system(self.windows.id)
+        with mock.patch.object(survey_cache, 'cache', wraps=survey_cache.cache) as shared_cache:
+            for _ in range(100):
+                self.assertEqual(survey_cache.get_operating_system(self.windows.id)['name'], 'Windows')
+        # row마다 shared cache를 확인하지 않음
+        self.assertEqual(shared_cache.get_or_set.call_count, 0)
+
+        # 다른 process의 invalidate는 OS_CATALOG_LOCAL_TIMEOUT 후에 반영
+        OperatingSystem.objects.filter(pk=self.windows.pk).update(price=0)
+        cache.set(survey_cache.OS_CATALOG_VERSION_KEY, 'other', None)
+        with self.settings(OS_CATALOG_LOCAL_TIMEOUT=0):
+            self.assertEqual(survey_cache.get_operating_system(self.windows.id)['price'], 0)
+
+    def test_post_survey_with_cached_os(self):
+        response = self.client.post(
+            '/api/v1/survey/',
+            {"os": "Windows", "python": 3, "rdb": 2, "programming": 4},
+            HTTP_AUTHORIZATION=self.token
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['os']['id'], self.windows.id)
+
+        response = self.client.post(
+            '/api/v1/survey/',
+            {"os": "MacOS", "python": 3, "rdb": 2, "programming": 4},
+            HTTP_AUTHORIZATION=self.token
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['os']['name'], 'MacOS')
+        self.assertEqual(OperatingSystem.objects.count(), 2)
+
+
+class SurveyStatisticsTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.windows = OperatingSystem.objects.create(name='Windows')
+        self.macos = OperatingSystem.objects.create(name='MacOS')
+
+    def _create_survey(self, os, major, python, rdb=3, programming=3):
+        return SurveyResult.objects.create(os=os, major=major, python=python, rdb=rdb, programming=programming)
+
+    def test_get_survey_stats(self):
+        self._create_survey(self.windows, '컴퓨터공학부', 1)
+        self._create_survey(self.windows, '경영학과', 3)
+        self._create_survey(self.macos, '컴퓨터공학부', 5, rdb=1)
+        self._create_survey(None, '', 4).delete()
+
+        # OperatingSystem 이름은 catalog cache에서
+        self.client.get('/api/v1/os/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/survey/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['python']['histogram'], {'1': 1, '2': 0, '3': 1, '4': 0, '5': 1})
+        self.assertEqual(data['python']['mean'], 3)
+
+        self.assertEqual([(os['name'], os['count']) for os in data['os']], [('Windows', 2), ('MacOS', 1)])
+        self.assertEqual(data['os'][0]['python']['mean'], 2)
+        self.assertEqual(data['os'][1]['rdb']['histogram']['1'], 1)
+
+        self.assertEqual([(major['major'], major['count']) for major in data['major']],
+                         [('경영학과', 1), ('컴퓨터공학부', 2)])
+
+        call_command('rebuild_survey_stats', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/v1/survey/stats/').json(), data)
+
+    def test_get_survey_stats_after_survey_update(self):
+        survey = self._create_survey(self.windows, '컴퓨터공학부', 1)
+        self._create_survey(self.windows, '경영학과', 3)
+
+        survey.os = self.macos
+        survey.major = '경영학과'
+        survey.python = 5
+        survey.save()
+
+        data = self.client.get('/api/v1/survey/stats/').json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['python']['histogram'], {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1})
+        self.assertEqual([(os['name'], os['count']) for os in data['os']], [('Windows', 1), ('MacOS', 1)])
+        self.assertEqual([(major['major'], major['count']) for major in data['major']], [('경영학과', 2)])
+
+        call_command('rebuild_survey_stats', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/v1/survey/stats/').json(), data)
+
+    def test_get_survey_stats_after_os_delete(self):
+        self._create_survey(self.windows, '컴퓨터공학부', 1)
+        self._create_survey(self.macos, '컴퓨터공학부', 5)
+        self._create_survey(None, '경영학과', 3)
+
+        self.windows.delete()
+
+        data = self.client.get('/api/v1/survey/stats/').json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual([(os['name'], os['count']) for os in data['os']], [('MacOS', 1), (None, 2)])
+        self.assertEqual(data['os'][1]['python']['histogram'], {'1': 1, '2': 0, '3': 1, '4': 0, '5': 0})
+
+        call_command('rebuild_survey_stats', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/v1/survey/stats/').json(), data)
+
+
+class GetSurveyExportTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        windows = OperatingSystem.objects.create(name='Windows')
+        self.surveys = [
+            SurveyResult.objects.create(os=windows if i else None, python=i + 1, rdb=3, programming=3, major=f'전공{i}')
+            for i in range(3)
+        ]
+
+    def _export(self, **params):
+        response = self.client.get('/api/v1/survey/export/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_get_survey_export(self):
+        lines = self._export().splitlines()
+        self.assertEqual(len(lines), 3)
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], [survey.id for survey in self.surveys])
+        self.assertEqual([row['os'] for row in rows], [None, 'Windows', 'Windows'])
+        self.assertEqual(rows[2]['major'], '전공2')
+
+        lines = self._export(type='csv').splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'os', 'user_id'])
+        self.assertEqual(len(lines), 4)
+
+        SurveyResult.objects.filter(pk=self.surveys[0].pk).update(timestamp='2020-01-01T00:00:00Z')
+        lines = self._export(since='2020-06-01T00:00:00Z').splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [survey.id for survey in self.surveys[1:]])
+
+        response = self.client.get('/api/v1/survey/export/', {'type': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GetSurveyListExpandTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.windows = OperatingSystem.objects.create(name='Windows')
+        self.user_index = 0
+
+    def _create_surveys(self, count):
+        for _ in range(count):
+            self.user_index += 1
+            user = User.objects.create_user(username=f'user{self.user_index}', password='password')
+            SurveyResult.objects.create(user=user, os=self.windows, python=3, rdb=3, programming=3)
+
+    def _get_surveys(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/survey/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.json()['results']
+
+    def test_get_survey_list_expand(self):
+        self.client.get('/api/v1/os/')
+        self._create_surveys(1)
+        query_count, surveys = self._get_surveys()
+        self.assertEqual(surveys[0]['user'], User.objects.get(username='user1').id)
+        expanded_query_count, surveys = self._get_surveys(expand='user')
+        self.assertEqual(surveys[0]['user']['username'], 'user1')
+        self.assertIsNone(surveys[0]['user']['participant'])
+
+        self._create_surveys(4)
+        self.assertEqual(self._get_surveys()[0], query_count)
+        self.assertEqual(self._get_surveys(expand='user')[0], expanded_query_count)
+
+        query_count, surveys = self._get_surveys(fields='id,python')
+        self.assertEqual(len(surveys), 5)
+        self.assertEqual(set(surveys[0]), {'id', 'python'})
+
+    def test_get_survey_expand_user_by_default(self):
+        self._create_surveys(1)
+        survey = SurveyResult.objects.get()
+        response = self.client.get(f'/api/v1/survey/{survey.id}/')
+        self.assertEqual(response.json()['user']['username'], 'user1')
+        response = self.client.get(f'/api/v1/survey/{survey.id}/', {'expand': ''})
+        self.assertEqual(response.json()['user'], survey.user_id)
+
+
+class GetSurveyConditionalTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.windows = OperatingSystem.objects.create(name='Windows')
+        self.survey = SurveyResult.objects.create(os=self.windows, python=3, rdb=3, programming=3)
+
+    def test_get_survey_not_modified(self):
+        for url in ('/api/v1/survey/', f'/api/v1/survey/{self.survey.id}/', '/api/v1/os/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # table 전체를 aggregate하지 않음 (retrieve는 pk로 그 row만)
+        etag = self.client.get('/api/v1/survey/')['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/v1/survey/', HTTP_IF_NONE_MATCH=etag).status_code,
+                             status.HTTP_304_NOT_MODIFIED)
+        url = f'/api/v1/survey/{self.survey.id}/'
+        detail_etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=detail_etag).status_code,
+                             status.HTTP_304_NOT_MODIFIED)
+
+        SurveyResult.objects.create(os=self.windows, python=1, rdb=1, programming=1)
+        response = self.client.get('/api/v1/survey/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(len(response.json()['results']), 2)
+
+        etag = self.client.get('/api/v1/os/')['ETag']
+        self.windows.name = 'Windows 11'
+        self.windows.save()
+        response = self.client.get('/api/v1/os/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()[0]['name'], 'Windows 11')
+
+
+    def test_get_survey_list_etag_matches_primary_body(self):
+        # 'replica' alias는 없으므로 replica로 간 read가 있으면 ConnectionDoesNotExist
+        with mock.patch('waffle_backend.db.routers.select_read_database', return_value='replica'):
+            etag = self.client.get('/api/v1/survey/')['ETag']
+            SurveyResult.objects.create(os=self.windows, python=1, rdb=1, programming=1)
+
+            response = self.client.get('/api/v1/survey/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.json()['results']), 2)
+            response = self.client.get('/api/v1/survey/', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class GetSurveyAsyncTestCase(TransactionTestCase):
+    # async endpoint는 pool thread의 별도 connection을 쓰므로 commit된 data가 필요
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        windows = OperatingSystem.objects.create(name='Windows')
+        self.survey = SurveyResult.objects.create(os=windows, python=3, rdb=3, programming=3)
+
+    def test_get_survey_async(self):
+        for path in ('survey/', f'survey/{self.survey.id}/', 'os/'):
+            response = self.client.get(f'/api/v1/async/{path}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), self.client.get(f'/api/v1/{path}').json())
+            self.assertIn('Server-Timing', response)
+
+            response = self.client.get(f'/api/v1/async/{path}', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.assertEqual(self.client.get('/api/v1/async/survey/0/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_survey_async_busy(self):
+        with self.settings(ASYNC_DB_WORKERS=0, ASYNC_DB_MAX_PENDING=0):
+            response = self.client.get('/api/v1/async/survey/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class CompiledSurveyParityTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        windows = OperatingSystem.objects.create(name='Windows', description='윈도우 "10"', price=100)
+        user = User.objects.create_user(username='part', password='password')
+        SurveyResult.objects.create(os=windows, user=user, python=3, rdb=2, programming=1, major='컴퓨터공학부',
+                                    grade='4', say_something='a\u2028b\n"c"')
+        SurveyResult.objects.create(python=5, rdb=5, programming=5)
+
+    def test_compiled_surveys_same_bytes_as_serializer(self):
+        queryset = SurveyResult.objects.order_by('id')
+        for fields in (None, {'id', 'os', 'timestamp'}, {'unknown'}):
+            context = {'expand': set(), 'fields': fields}
+            compiled = compile_surveys(survey_rows(queryset), fields)
+            serialized = SurveyResultSerializer(queryset, many=True, context=context).data
+            self.assertEqual(FastJSONRenderer().render(compiled), JSONRenderer().render(serialized))
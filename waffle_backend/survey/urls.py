@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 from survey.views import OperatingSystemViewSet, SurveyResultViewSet
+from waffle_backend.async_views import async_read_view
 
 app_name = 'survey'
 
@@ -10,4 +11,8 @@ router.register('os', OperatingSystemViewSet, basename='os')
 
 urlpatterns = [
     path('', include((router.urls))),
+    path('async/survey/', async_read_view(SurveyResultViewSet, {'get': 'list'}), name='survey-list-async'),
+    path('async/survey/<int:pk>/', async_read_view(SurveyResultViewSet, {'get': 'retrieve'}),
+         name='survey-detail-async'),
+    path('async/os/', async_read_view(OperatingSystemViewSet, {'get': 'list'}), name='os-list-async'),
 ]
@@ -1,28 +1,106 @@
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from seminar.cache import get_seminars_version
+from survey.cache import get_operating_system, get_operating_systems, get_os_catalog_version, get_survey_version
+from survey.compiled import compile_surveys, survey_rows
+from survey.export import CONTENT_TYPES, iter_export
+from survey.pagination import SurveyResultCursorPagination
 from survey.serializers import OperatingSystemSerializer, SurveyResultSerializer
+from survey.stats import get_survey_statistics
 from survey.models import OperatingSystem, SurveyResult
+from user.cache import get_user_data_version
+from waffle_backend.conditional import ConditionalGetMixin
+from waffle_backend.db.routers import ReplicaReadMixin, get_read_database
+from waffle_backend.metrics import MetricsViewMixin, timed
 
 
-class SurveyResultViewSet(viewsets.GenericViewSet):
+class SurveyResultViewSet(ReplicaReadMixin, MetricsViewMixin, ConditionalGetMixin, viewsets.GenericViewSet):
     queryset = SurveyResult.objects.all()
     serializer_class = SurveyResultSerializer
     permission_classes = (IsAuthenticated(), )
+    pagination_class = SurveyResultCursorPagination
+    replica_actions = ('list', 'retrieve', 'stats', 'export')
 
     def get_permissions(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'stats', 'export'):
             return (AllowAny(), )
         return self.permission_classes
 
+    def _get_expand(self):
+        # ?expand=user (list는 기본적으로 user id만, 나머지는 기존처럼 user까지)
+        expand = self.request.query_params.get('expand')
+        if expand is None:
+            return set() if self.action == 'list' else {'user'}
+        return {name for name in expand.split(',') if name in SurveyResultSerializer.EXPANDABLE_FIELDS}
+
+    def get_serializer_context(self):
+        context = super(SurveyResultViewSet, self).get_serializer_context()
+        context['expand'] = self._get_expand()
+
+        # ?fields=id,python,...
+        fields = self.request.query_params.get('fields')
+        if fields:
+            context['fields'] = set(fields.split(','))
+        return context
+
+    def _validators(self, surveys):
+        # surveys: list는 table 전체 aggregate 대신 cache의 version, retrieve는 pk로 그 row만
+        validators = {
+            'surveys': surveys,
+            'os': get_os_catalog_version(),
+        }
+        if 'user' in self._get_expand():
+            # UserSerializer에 포함되는 profile, seminar 정보
+            validators.update(users=get_user_data_version(), seminars=get_seminars_version())
+        return validators
+
     def list(self, request):
-        surveys = self.get_queryset().select_related('os', 'user')
-        return Response(self.get_serializer(surveys, many=True).data)
+        def get_response():
+            # os는 OperatingSystem catalog cache에서
+            expand = self._get_expand()
+            if not expand:
+                page = self.paginate_queryset(survey_rows(self.get_queryset()))
+                with timed('serialize'):
+                    data = compile_surveys(page, self.get_serializer_context().get('fields'))
+                return self.get_paginated_response(data)
+
+            surveys = self.get_serializer_class().setup_eager_loading(self.get_queryset(), expand)
+            page = self.paginate_queryset(surveys)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        validators = self._validators(get_survey_version())
+        return self.conditional_response(request, get_response, validators)
 
     def retrieve(self, request, pk=None):
-        survey = self.get_object()
-        return Response(self.get_serializer(survey).data)
+        def get_response():
+            if not self._get_expand():
+                try:
+                    surveys = list(survey_rows(self.get_queryset().filter(pk=pk)))
+                except (TypeError, ValueError):
+                    surveys = []
+                if not surveys:
+                    raise Http404
+                with timed('serialize'):
+                    return Response(compile_surveys(surveys, self.get_serializer_context().get('fields'))[0])
+
+            survey = self.get_object()
+            return Response(self.get_serializer(survey).data)
+
+        try:
+            validators = self._validators(
+                self.get_queryset().filter(pk=pk).aggregate(timestamp=Max('timestamp'), count=Count('id'))
+            )
+        except (TypeError, ValueError):
+            return get_response()
+        if validators['surveys']['timestamp'] is None:
+            return get_response()
+        return self.conditional_response(request, get_response, validators, validators['surveys']['timestamp'])
 
     def create(self, request):
         data = request.data.copy()
@@ -33,14 +111,45 @@ class SurveyResultViewSet(viewsets.GenericViewSet):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    # GET /api/v1/survey/export/?type=ndjson|csv&since=2020-08-25T22:04:25
+    @action(detail=False, methods=['GET'])
+    def export(self, request):
+        # ?format=은 DRF renderer 선택에 쓰이므로 ?type=
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in CONTENT_TYPES:
+            return Response({"error": "Type should be either ndjson or csv"}, status=status.HTTP_400_BAD_REQUEST)
+
+        since = request.query_params.get('since')
+        if since:
+            since = parse_datetime(since)
+            if since is None:
+                return Response({"error": "Since should be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # body는 view가 끝난 뒤에 읽으므로 replica를 명시
+        response = StreamingHttpResponse(
+            iter_export(export_type, since, using=get_read_database()), content_type=CONTENT_TYPES[export_type]
+        )
+        response['Content-Disposition'] = f'attachment; filename="surveyresult.{export_type}"'
+        return response
 
-class OperatingSystemViewSet(viewsets.GenericViewSet):
+    # GET /api/v1/survey/stats/
+    @action(detail=False, methods=['GET'])
+    def stats(self, request):
+        return Response(get_survey_statistics())
+
+
+class OperatingSystemViewSet(ReplicaReadMixin, MetricsViewMixin, ConditionalGetMixin, viewsets.GenericViewSet):
     queryset = OperatingSystem.objects.all()
     serializer_class = OperatingSystemSerializer
 
     def list(self, request):
-        return Response(self.get_serializer(self.get_queryset(), many=True).data)
+        return self.conditional_response(request, lambda: Response(get_operating_systems()), get_os_catalog_version())
 
     def retrieve(self, request, pk=None):
-        os = self.get_object()
-        return Response(self.get_serializer(os).data)
+        def get_response():
+            os = get_operating_system(pk)
+            if os is None:
+                raise Http404
+            return Response(os)
+
+        return self.conditional_response(request, get_response, get_os_catalog_version())
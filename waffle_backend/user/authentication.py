@@ -0,0 +1,87 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+AUTH_VERSION_KEY = 'user:auth_version:{}'
+
+
+def _auth_version(user_id):
+    return cache.get_or_set(AUTH_VERSION_KEY.format(user_id), lambda: uuid4().hex, None)
+
+
+class TokenCache:
+    # token key -> Token(+ user, participant, instructor), process-local TTL/LRU
+    # 다른 process에서의 invalidate는 shared cache의 user별 version으로 감지
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, version, token = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        if version != _auth_version(token.user_id):
+            self.delete(key)
+            return None
+        # request마다 user를 수정할 수 있으므로 cache된 instance는 공유하지 않음
+        return copy.deepcopy(token)
+
+    def set(self, key, token):
+        entry = (time.monotonic() + self.timeout, _auth_version(token.user_id), copy.deepcopy(token))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TIMEOUT)
+
+
+def invalidate_user_auth(user_id):
+    cache.set(AUTH_VERSION_KEY.format(user_id), uuid4().hex, None)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                # participant/instructor가 없으면 None이 cache되므로 hasattr 확인에 query가 나가지 않음
+                token = model.objects.select_related('user', 'user__participant', 'user__instructor').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            token_cache.set(key, token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
@@ -0,0 +1,14 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+USER_DATA_VERSION_KEY = 'user:data_version'
+
+
+def get_user_data_version():
+    # User/profile이 바뀔 때마다 바뀌는 값, user 정보가 포함된 response의 ETag에 사용
+    return cache.get_or_set(USER_DATA_VERSION_KEY, lambda: uuid4().hex, None)
+
+
+def touch_user_data_version():
+    cache.set(USER_DATA_VERSION_KEY, uuid4().hex, None)
@@ -0,0 +1,92 @@
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.encoding import force_bytes
+
+_pool_lock = threading.Lock()
+_pools = {}  # worker 수 -> ThreadPoolExecutor
+
+
+def _pbkdf2_hmac(digest_name, password, salt, iterations):
+    # hashlib.pbkdf2_hmac은 계산 중 GIL을 놓으므로 thread끼리도 여러 core에서 동시에 돎
+    return hashlib.pbkdf2_hmac(digest_name, password, salt, iterations)
+
+
+def _get_pool(workers=None):
+    # workers가 없으면 PASSWORD_HASH_WORKERS, 0이면 pool 없이 inline
+    if workers is None:
+        workers = settings.PASSWORD_HASH_WORKERS
+    if workers <= 0:
+        return None
+
+    with _pool_lock:
+        if workers not in _pools:
+            _pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        return _pools[workers]
+
+
+def shutdown_pool():
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    # pbkdf2_sha256 그대로, iteration 수는 settings에서 (바뀌면 다음 login 때 check_password가 rehash)
+    # PASSWORD_HASH_WORKERS > 0이면 PBKDF2 계산을 request thread 대신 크기가 제한된 thread pool에서
+    # -> signup/login이 몰려도 hash에 쓰는 core 수는 workers로 제한됨
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        pool = _get_pool()
+        if pool is None:
+            return super(PBKDF2PasswordHasher, self).encode(password, salt, iterations)
+
+        assert password is not None
+        assert salt and '$' not in salt
+        iterations = iterations or self.iterations
+        hash = pool.submit(
+            _pbkdf2_hmac, self.digest().name, force_bytes(password), force_bytes(salt), iterations
+        ).result()
+        return self._format(iterations, salt, hash)
+
+    def encode_many(self, passwords, workers=None):
+        # bulk 생성용: pool이 있으면 여러 password를 worker thread들에 나눠서 동시에
+        # workers: 이번 호출의 thread 수 (없으면 PASSWORD_HASH_WORKERS)
+        salts = [self.salt() for _ in passwords]
+        pool = _get_pool(workers)
+        if pool is None:
+            return [
+                super(PBKDF2PasswordHasher, self).encode(password, salt) for password, salt in zip(passwords, salts)
+            ]
+
+        iterations = self.iterations
+        hashes = pool.map(
+            _pbkdf2_hmac,
+            repeat(self.digest().name),
+            [force_bytes(password) for password in passwords],
+            [force_bytes(salt) for salt in salts],
+            repeat(iterations),
+        )
+        return [self._format(iterations, salt, hash) for salt, hash in zip(salts, hashes)]
+
+    def _format(self, iterations, salt, hash):
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, hash)
+
+
+def make_passwords(passwords, workers=None):
+    hasher = hashers.get_hasher()
+    if isinstance(hasher, PBKDF2PasswordHasher):
+        return hasher.encode_many(passwords, workers)
+    return [hashers.make_password(password) for password in passwords]
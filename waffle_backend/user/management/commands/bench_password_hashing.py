@@ -0,0 +1,97 @@
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from user.hashers import shutdown_pool
+from waffle_backend.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark signup (POST /api/v1/user/) and login (PUT /api/v1/user/login/) throughput against the configured '
+        'database with the current password hasher policy, reporting requests per second per core'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Number of users to sign up and log in')
+        parser.add_argument('--threads', type=int, default=4, help='Number of concurrent request threads')
+        parser.add_argument('--iterations', type=int, default=None,
+                            help='Override PASSWORD_HASH_ITERATIONS for this run')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Override PASSWORD_HASH_WORKERS (hashing threads, 0: inline) for this run')
+
+    def handle(self, *args, **options):
+        if options['users'] <= 0 or options['threads'] <= 0:
+            raise CommandError('--users and --threads should be positive numbers')
+
+        overrides = {}
+        if options['iterations'] is not None:
+            overrides['PASSWORD_HASH_ITERATIONS'] = options['iterations']
+        if options['workers'] is not None:
+            overrides['PASSWORD_HASH_WORKERS'] = options['workers']
+
+        prefix = f'bench_{uuid4().hex[:8]}'
+        with override_settings(**overrides):
+            try:
+                self._run(prefix, options)
+            finally:
+                shutdown_pool()
+                User.objects.filter(username__startswith=f'{prefix}_').delete()
+
+    def _run(self, prefix, options):
+        cores = min(os.cpu_count() or 1, max(options['threads'], settings.PASSWORD_HASH_WORKERS))
+        self.stdout.write(
+            f'iterations={settings.PASSWORD_HASH_ITERATIONS} workers={settings.PASSWORD_HASH_WORKERS} '
+            f"threads={options['threads']} cores={cores}"
+        )
+        usernames = [f'{prefix}_{i}' for i in range(options['users'])]
+
+        def signup(username):
+            return Client(HTTP_HOST='localhost').post('/api/v1/user/', json.dumps({
+                'username': username,
+                'password': 'password',
+                'email': f'{username}@example.com',
+                'role': 'participant',
+            }), content_type='application/json')
+
+        def login(username):
+            return Client(HTTP_HOST='localhost').put('/api/v1/user/login/', json.dumps({
+                'username': username,
+                'password': 'password',
+            }), content_type='application/json')
+
+        for name, request in (('signup', signup), ('login', login)):
+            latencies, statuses, elapsed = self._bench(request, usernames, options['threads'])
+            throughput = len(latencies) / elapsed
+            self.stdout.write(
+                f'{name}: {len(latencies)} requests in {elapsed:.3f}s ({throughput:.1f} req/s, '
+                f'{throughput / cores:.1f} req/s per core) '
+                f'p50={percentile(latencies, 50) * 1000:.1f}ms '
+                f'p95={percentile(latencies, 95) * 1000:.1f}ms '
+                f"status {', '.join(f'{code}: {count}' for code, count in sorted(statuses.items()))}"
+            )
+
+    def _bench(self, request, usernames, threads):
+        def worker(username):
+            start = time.perf_counter()
+            try:
+                status_code = request(username).status_code
+            finally:
+                connection.close()
+            return time.perf_counter() - start, status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(worker, usernames))
+        elapsed = time.perf_counter() - start
+        return sorted(latency for latency, _ in results), Counter(status_code for _, status_code in results), elapsed
@@ -0,0 +1,46 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user.hashers import shutdown_pool
+from user.provisioning import DEFAULT_CHUNK_SIZE, FILE_TYPES, provision_users, read_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Create users (with tokens and participant/instructor profiles) from a CSV or JSON file in bulk, '
+        'reporting invalid rows without aborting the rest'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with a header row) or JSON (list of users) file')
+        parser.add_argument('--type', choices=FILE_TYPES, default=None,
+                            help='File type, guessed from the file extension by default')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Number of rows created per bulk insert')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of password hashing threads (0: inline)')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0 or options['workers'] < 0:
+            raise CommandError('--chunk-size should be positive and --workers should not be negative')
+
+        file_type = options['type'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if file_type not in FILE_TYPES:
+            raise CommandError(f"Cannot guess the file type of {options['path']}, use --type")
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as f:
+                rows = read_users(f, file_type)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read users: {e}')
+
+        try:
+            created, rejected = provision_users(rows, chunk_size=options['chunk_size'], workers=options['workers'])
+        finally:
+            shutdown_pool()
+
+        for rejection in rejected:
+            self.stderr.write(f"row {rejection['row']} ({rejection['username']}): {json.dumps(rejection['errors'], ensure_ascii=False)}")
+        self.stdout.write(f'created {len(created)} users, rejected {len(rejected)} rows')
@@ -0,0 +1,143 @@
+import csv
+import json
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+
+from seminar.models import UserSeminar
+from user.hashers import make_passwords
+from user.models import InstructorProfile, ParticipantProfile
+from user.serializers import UserProvisionSerializer
+
+DEFAULT_CHUNK_SIZE = 500
+FILE_TYPES = ('csv', 'json')
+# 동시에 같은 username으로 가입한 경우 등 IntegrityError가 나면 다시 확인 후 재시도
+MAX_ATTEMPTS = 3
+
+USERNAME_EXISTS_ERROR = 'A user with that username already exists.'
+
+
+def read_users(f, file_type):
+    if file_type == 'csv':
+        # 빈 칸은 입력하지 않은 것으로
+        return [{key: value for key, value in row.items() if value not in ('', None)} for row in csv.DictReader(f)]
+
+    data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('users')
+    if not isinstance(data, list):
+        raise ValueError('JSON should be a list of users or {"users": [...]}')
+    return data
+
+
+def provision_users(rows, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    # row 번호는 1부터, 잘못된 row는 rejected에 모으고 나머지는 계속 생성
+    # workers: password hash thread 수 (없으면 PASSWORD_HASH_WORKERS)
+    created = []
+    rejected = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = list(enumerate(rows[start:start + chunk_size], start=start + 1))
+        chunk_created, chunk_rejected = _provision_chunk(chunk, workers)
+        created += chunk_created
+        rejected += sorted(chunk_rejected, key=lambda rejection: rejection['row'])
+    return created, rejected
+
+
+def _reject(index, row, errors):
+    return {"row": index, "username": row.get('username') if isinstance(row, dict) else None, "errors": errors}
+
+
+def _validate_chunk(chunk):
+    valid = []
+    rejected = []
+    usernames = set()
+    for index, row in chunk:
+        if not isinstance(row, dict):
+            rejected.append(_reject(index, row, {"non_field_errors": ["Row should be an object"]}))
+            continue
+
+        serializer = UserProvisionSerializer(data=row)
+        if not serializer.is_valid():
+            rejected.append(_reject(index, row, serializer.errors))
+            continue
+
+        data = serializer.validated_data
+        if data['username'] in usernames:
+            rejected.append(_reject(index, row, {"username": [USERNAME_EXISTS_ERROR]}))
+            continue
+        usernames.add(data['username'])
+        valid.append((index, row, data))
+    return valid, rejected
+
+
+def _provision_chunk(chunk, workers):
+    valid, rejected = _validate_chunk(chunk)
+    passwords = make_passwords([data['password'] for _, _, data in valid], workers)
+    valid = [(index, row, data, password) for (index, row, data), password in zip(valid, passwords)]
+
+    for _ in range(MAX_ATTEMPTS):
+        existing = set(User.objects.filter(
+            username__in=[data['username'] for _, _, data, _ in valid]
+        ).values_list('username', flat=True))
+        rejected += [
+            _reject(index, row, {"username": [USERNAME_EXISTS_ERROR]})
+            for index, row, data, _ in valid if data['username'] in existing
+        ]
+        valid = [item for item in valid if item[2]['username'] not in existing]
+        if not valid:
+            return [], rejected
+
+        try:
+            with transaction.atomic():
+                return _create_users(valid), rejected
+        except IntegrityError:
+            continue
+
+    rejected += [_reject(index, row, {"non_field_errors": ["Could not create this user, please retry"]})
+                 for index, row, _, _ in valid]
+    return [], rejected
+
+
+def _create_users(valid):
+    # UserSerializer.create와 같은 결과를 User, Token, profile별 bulk_create로
+    User.objects.bulk_create([
+        User(
+            username=data['username'],
+            email=data['email'],
+            first_name=data.get('first_name', ''),
+            last_name=data.get('last_name', ''),
+            password=password,
+        )
+        for _, _, data, password in valid
+    ])
+    # MySQL의 bulk_create는 pk를 채워주지 않음
+    user_ids = dict(User.objects.filter(
+        username__in=[data['username'] for _, _, data, _ in valid]
+    ).values_list('username', 'id'))
+
+    tokens = []
+    participants = []
+    instructors = []
+    for _, _, data, _ in valid:
+        user_id = user_ids[data['username']]
+        token = Token(user_id=user_id)
+        token.key = token.generate_key()
+        tokens.append(token)
+        if data['role'] == UserSeminar.PARTICIPANT:
+            participants.append(ParticipantProfile(
+                user_id=user_id, university=data.get('university', ''), accepted=data.get('accepted', True)
+            ))
+        else:
+            instructors.append(InstructorProfile(
+                user_id=user_id, company=data.get('company', ''), year=data.get('year')
+            ))
+
+    Token.objects.bulk_create(tokens)
+    ParticipantProfile.objects.bulk_create(participants)
+    InstructorProfile.objects.bulk_create(instructors)
+
+    return [
+        {"row": index, "id": user_ids[data['username']], "username": data['username'], "token": token.key}
+        for (index, _, data, _), token in zip(valid, tokens)
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
 
@@ -59,6 +61,22 @@ class UserSerializer(serializers.ModelSerializer):
             'year',
         )
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # profile은 select_related, role별 user_seminars(+ seminar)는 prefetch -> seminar 이력과 관계없이 query 수 일정
+        return queryset.select_related('participant', 'instructor').prefetch_related(
+            Prefetch(
+                'user_seminars',
+                queryset=UserSeminar.objects.filter(role=UserSeminar.PARTICIPANT).select_related('seminar').order_by('id'),
+                to_attr='participant_seminars',
+            ),
+            Prefetch(
+                'user_seminars',
+                queryset=UserSeminar.objects.filter(role=UserSeminar.INSTRUCTOR).select_related('seminar').order_by('id'),
+                to_attr='instructor_seminars',
+            ),
+        )
+
     def get_participant(self, user):
         if hasattr(user, 'participant'):
             return ParticipantProfileSerializer(user.participant, context=self.context).data
@@ -74,7 +92,6 @@ class UserSerializer(serializers.ModelSerializer):
         return make_password(value)
 
     def validate(self, data):
-        print("DEBUG: UserSerializer.validate()")
         # validate name fields
         first_name = data.get('first_name')
         last_name = data.get('last_name')
@@ -110,7 +127,6 @@ class UserSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def create(self, validated_data):
-        print("DEBUG: UserSerializer.create()")
         role = validated_data.pop('role')
 
         university = validated_data.pop('university', '')
@@ -140,8 +156,6 @@ class UserSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def update(self, user, validated_data):
-        print("DEBUG: UserSerializer.update()")
-
         # update할 때는 'participant' or 'instructor'라는 이름의 json 형식의 정보 자체가 있어야함
         if hasattr(user, UserSeminar.PARTICIPANT):
             # participant
@@ -167,6 +181,18 @@ class UserSerializer(serializers.ModelSerializer):
         return super(UserSerializer, self).update(user, validated_data)
 
 
+class UserProvisionSerializer(UserSerializer):
+    # bulk 생성(user.provisioning)의 row 검증용, username 중복 확인과 password hash는 chunk 단위로 따로
+
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = {
+            'username': {'validators': [UnicodeUsernameValidator()]},
+        }
+
+    def validate_password(self, value):
+        return value
+
+
 class ParticipantProfileSerializer(serializers.ModelSerializer):
     # default = True가 필요함. objects.create()에 accepted를 안주면 models.py에 의해 기본이 True이지만,
     # Serializer에서 accepted를 주므로 이 값으로 덮어씌워짐. 그런데, 이 Field의 기본값이 False이면 결국 db엔 False가 들어감
@@ -187,7 +213,11 @@ class ParticipantProfileSerializer(serializers.ModelSerializer):
     def get_seminars(self, participant_profile):
         # participant profile에서 user로 넘어온 다음, user seminar 부르고, 거기서 filter
         # 즉, UserSeminar.objects.filter(user=participant_profile.user, role=UserSeminar.PARTICIPANT)와 같음
-        participant_seminars = participant_profile.user.user_seminars.filter(role=UserSeminar.PARTICIPANT)
+        user = participant_profile.user
+        if hasattr(user, 'participant_seminars'):
+            participant_seminars = user.participant_seminars
+        else:
+            participant_seminars = user.user_seminars.filter(role=UserSeminar.PARTICIPANT).select_related('seminar')
 
         # 여기는 존재 체크를 하면, return None에 의해, 빈 리스트조차 넘겨주지 않음 -> many=True에서는 그냥 이렇게
         return SeminarAsParticipantSerializer(participant_seminars, many=True, context=self.context).data
@@ -208,7 +238,11 @@ class InstructorProfileSerializer(serializers.ModelSerializer):
 
     def get_charge(self, instructor_profile):
         # last() 어차피 0개 아니면 1개일텐데, try handle하는 것 보단, last() 이용 -> 없으면 None 반환
-        instructor_seminar = instructor_profile.user.user_seminars.filter(role=UserSeminar.INSTRUCTOR).last()
+        user = instructor_profile.user
+        if hasattr(user, 'instructor_seminars'):
+            instructor_seminar = user.instructor_seminars[-1] if user.instructor_seminars else None
+        else:
+            instructor_seminar = user.user_seminars.filter(role=UserSeminar.INSTRUCTOR).select_related('seminar').last()
         if instructor_seminar:
             return SeminarAsInstructorSerializer(instructor_seminar, context=self.context).data
         return None
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user.authentication import invalidate_user_auth
+from user.cache import touch_user_data_version
+from user.models import InstructorProfile, ParticipantProfile
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_auth_on_user_change(sender, instance, **kwargs):
+    invalidate_user_auth(instance.pk)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+@receiver(post_save, sender=ParticipantProfile)
+@receiver(post_delete, sender=ParticipantProfile)
+@receiver(post_save, sender=InstructorProfile)
+@receiver(post_delete, sender=InstructorProfile)
+def invalidate_user_auth_on_related_change(sender, instance, **kwargs):
+    invalidate_user_auth(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=ParticipantProfile)
+@receiver(post_delete, sender=ParticipantProfile)
+@receiver(post_save, sender=InstructorProfile)
+@receiver(post_delete, sender=InstructorProfile)
+def touch_user_data_version_on_change(sender, update_fields=None, **kwargs):
+    # login마다 바뀌는 last_login만 저장된 경우는 제외
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    touch_user_data_version()
@@ -1,9 +1,23 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
 import json
 
+from seminar.models import Seminar, UserSeminar
+from user.authentication import CachedTokenAuthentication, token_cache
+from user.hashers import PBKDF2PasswordHasher, shutdown_pool
 from user.models import InstructorProfile, ParticipantProfile
 
 
@@ -296,4 +310,225 @@ class PutUserMeTestCase(TestCase):
         self.assertIsNone(instructor["charge"])
 
         instructor_user = User.objects.get(username='inst123')
-        self.assertEqual(instructor_user.email, 'bdv111@naver.com')
\ No newline at end of file
+        self.assertEqual(instructor_user.email, 'bdv111@naver.com')
+
+
+class CachedTokenAuthenticationTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_user(username='part', password='password')
+        self.token = Token.objects.create(user=self.user)
+
+    def test_authenticate_from_cache(self):
+        authentication = CachedTokenAuthentication()
+        with self.assertNumQueries(1):
+            user, token = authentication.authenticate_credentials(self.token.key)
+            self.assertFalse(hasattr(user, 'participant'))
+
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(self.token.key)
+            self.assertFalse(hasattr(user, 'participant'))
+            self.assertFalse(hasattr(user, 'instructor'))
+            self.assertEqual(user.username, 'part')
+
+        ParticipantProfile.objects.create(user=self.user)
+        user, token = authentication.authenticate_credentials(self.token.key)
+        self.assertTrue(hasattr(user, 'participant'))
+
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(self.token.key)
+
+
+class GetUserMeQueryCountTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(username='part', password='password')
+        ParticipantProfile.objects.create(user=self.user, university='서울대학교')
+        InstructorProfile.objects.create(user=self.user, company='와플스튜디오')
+        self.token = 'Token ' + Token.objects.create(user=self.user).key
+        self.seminar_index = 0
+        self.client.get('/api/v1/user/me/', HTTP_AUTHORIZATION=self.token)
+
+    def _join_seminars(self, count, role=UserSeminar.PARTICIPANT):
+        for _ in range(count):
+            self.seminar_index += 1
+            seminar = Seminar.objects.create(name=f'seminar{self.seminar_index}', capacity=10, count=5, time='14:00')
+            UserSeminar.objects.create(user=self.user, seminar=seminar, role=role)
+
+    def _get_me(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/user/me/', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.json()
+
+    def test_get_user_me_query_count(self):
+        self._join_seminars(1)
+        query_count, data = self._get_me()
+        self.assertEqual(len(data['participant']['seminars']), 1)
+        self.assertIsNone(data['instructor']['charge'])
+
+        self._join_seminars(5)
+        self._join_seminars(1, role=UserSeminar.INSTRUCTOR)
+        query_count_many, data = self._get_me()
+        self.assertEqual(query_count_many, query_count)
+        self.assertEqual([seminar['name'] for seminar in data['participant']['seminars']],
+                         [f'seminar{i}' for i in range(1, 7)])
+        self.assertEqual(data['instructor']['charge']['name'], 'seminar7')
+
+
+class PasswordHasherTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        settings = self.settings(PASSWORD_HASHERS=['user.hashers.PBKDF2PasswordHasher'], PASSWORD_HASH_ITERATIONS=1000)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def _login(self):
+        return self.client.put(
+            '/api/v1/user/login/',
+            json.dumps({"username": "part", "password": "password"}),
+            content_type='application/json'
+        )
+
+    def test_rehash_on_login(self):
+        response = self.client.post(
+            '/api/v1/user/',
+            json.dumps({
+                "username": "part",
+                "password": "password",
+                "email": "bdv111@snu.ac.kr",
+                "role": "participant",
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(User.objects.get(username='part').password.startswith('pbkdf2_sha256$1000$'))
+
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.assertEqual(self._login().status_code, status.HTTP_200_OK)
+            self.assertTrue(User.objects.get(username='part').password.startswith('pbkdf2_sha256$2000$'))
+            self.assertEqual(self._login().status_code, status.HTTP_200_OK)
+
+    def test_hash_in_thread_pool(self):
+        hasher = PBKDF2PasswordHasher()
+        encoded = hasher.encode('password', 'salt')
+        with self.settings(PASSWORD_HASH_WORKERS=2):
+            self.addCleanup(shutdown_pool)
+            self.assertEqual(hasher.encode('password', 'salt'), encoded)
+            self.assertTrue(hasher.verify('password', encoded))
+            self.assertFalse(hasher.verify('wrong', encoded))
+
+
+class PostUserBulkTestCase(TestCase):
+    client = Client()
+
+    def setUp(self):
+        settings = self.settings(PASSWORD_HASHERS=['user.hashers.PBKDF2PasswordHasher'], PASSWORD_HASH_ITERATIONS=1000)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.admin = User.objects.create_superuser(username='admin', email='admin@snu.ac.kr', password='password')
+        self.admin_token = 'Token ' + Token.objects.create(user=self.admin).key
+        User.objects.create_user(username='taken', email='taken@snu.ac.kr', password='password')
+
+    def _post(self, users, token):
+        return self.client.post(
+            '/api/v1/user/bulk/',
+            json.dumps(users),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=token
+        )
+
+    def test_post_user_bulk_not_admin(self):
+        user = User.objects.get(username='taken')
+        response = self._post([], 'Token ' + Token.objects.create(user=user).key)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_post_user_bulk(self):
+        response = self._post({"users": [
+            {"username": "part", "password": "password", "email": "part@snu.ac.kr", "role": "participant",
+             "university": "서울대학교", "accepted": False},
+            {"username": "inst", "password": "password", "email": "inst@snu.ac.kr", "role": "instructor",
+             "company": "wafflestudio", "year": 3},
+            {"username": "taken", "password": "password", "email": "taken@snu.ac.kr", "role": "participant"},
+            {"username": "part", "password": "password", "email": "part@snu.ac.kr", "role": "participant"},
+            {"username": "norole", "password": "password", "email": "norole@snu.ac.kr"},
+            {"username": "badyear", "password": "password", "email": "badyear@snu.ac.kr", "role": "instructor",
+             "year": -1},
+            "part",
+        ]}, self.admin_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        data = response.json()
+        self.assertEqual([user["username"] for user in data["created"]], ["part", "inst"])
+        self.assertEqual([user["row"] for user in data["rejected"]], [3, 4, 5, 6, 7])
+        self.assertIn("username", data["rejected"][0]["errors"])
+        self.assertIn("username", data["rejected"][1]["errors"])
+        self.assertIn("role", data["rejected"][2]["errors"])
+
+        part = User.objects.get(username='part')
+        self.assertTrue(part.check_password('password'))
+        self.assertTrue(part.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertEqual(part.auth_token.key, data["created"][0]["token"])
+        self.assertEqual(part.participant.university, "서울대학교")
+        self.assertFalse(part.participant.accepted)
+
+        inst = User.objects.get(username='inst')
+        self.assertEqual(inst.instructor.company, "wafflestudio")
+        self.assertEqual(inst.instructor.year, 3)
+        self.assertFalse(hasattr(inst, 'participant'))
+
+        response = self.client.put(
+            '/api/v1/user/login/',
+            json.dumps({"username": "inst", "password": "password"}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_post_user_bulk_csv_file(self):
+        upload = SimpleUploadedFile(
+            'users.csv',
+            'username,password,email,role,university,company,year\n'
+            'part,password,part@snu.ac.kr,participant,서울대학교,,\n'
+            'inst,password,inst@snu.ac.kr,instructor,,wafflestudio,3\n'
+            'taken,password,taken@snu.ac.kr,participant,,,\n'.encode('utf-8'),
+            content_type='text/csv'
+        )
+        with self.settings(PASSWORD_HASH_WORKERS=2):
+            self.addCleanup(shutdown_pool)
+            response = self.client.post(
+                '/api/v1/user/bulk/', {'file': upload}, HTTP_AUTHORIZATION=self.admin_token
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        data = response.json()
+        self.assertEqual(len(data["created"]), 2)
+        self.assertEqual([user["row"] for user in data["rejected"]], [3])
+        self.assertTrue(User.objects.get(username='part').check_password('password'))
+        self.assertEqual(User.objects.get(username='part').participant.university, "서울대학교")
+        self.assertEqual(User.objects.get(username='inst').instructor.year, 3)
+
+    def test_provision_users_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump([
+                {"username": "part", "password": "password", "email": "part@snu.ac.kr", "role": "participant"},
+                {"username": "taken", "password": "password", "email": "taken@snu.ac.kr", "role": "participant"},
+            ], f)
+        self.addCleanup(os.remove, f.name)
+
+        stdout = StringIO()
+        self.addCleanup(shutdown_pool)
+        call_command('provision_users', f.name, '--workers', '2', '--chunk-size', '1', stdout=stdout, stderr=StringIO())
+        self.assertIn('created 1 users, rejected 1 rows', stdout.getvalue())
+        self.assertTrue(User.objects.get(username='part').check_password('password'))
+        # --workers는 settings를 바꾸지 않음
+        self.assertEqual(settings.PASSWORD_HASH_WORKERS, 0)
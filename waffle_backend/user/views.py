@@ -1,29 +1,42 @@
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.db import IntegrityError
+from io import TextIOWrapper
 from rest_framework import status, viewsets
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from user.authentication import invalidate_user_auth
+from user.provisioning import provision_users, read_users
 from user.serializers import UserSerializer, ParticipantProfileSerializer
+from waffle_backend.db.routers import ReplicaReadMixin
+from waffle_backend.metrics import MetricsViewMixin
 
 
-class UserViewSet(viewsets.GenericViewSet):
+class UserViewSet(ReplicaReadMixin, MetricsViewMixin, viewsets.GenericViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     # 이거 자체는 class의 tuple로. get_permissions를 override할 때 return을 super로
     permission_classes = (IsAuthenticated, )
+    replica_actions = ('retrieve', )
+
+    def get_queryset(self):
+        queryset = super(UserViewSet, self).get_queryset()
+        if self.action in ('retrieve', 'update', 'login'):
+            queryset = self.get_serializer_class().setup_eager_loading(queryset)
+        return queryset
 
     def get_permissions(self):
         if self.action in ('create', 'login'):
             return (AllowAny(), )
+        if self.action == 'bulk':
+            return (IsAdminUser(), )
         return super(UserViewSet, self).get_permissions()
 
     # POST /api/v1/user/
     def create(self, request):
-        print("DEBUG: UserViewSet.create()")
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
@@ -37,10 +50,28 @@ class UserViewSet(viewsets.GenericViewSet):
         data['token'] = user.auth_token.key
         return Response(data, status=status.HTTP_201_CREATED)
 
+    # POST /api/v1/user/bulk/
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request):
+        # JSON list / {"users": [...]} 또는 multipart의 CSV/JSON 'file'
+        upload = request.FILES.get('file')
+        if upload:
+            file_type = 'json' if upload.name.lower().endswith('.json') else 'csv'
+            try:
+                rows = read_users(TextIOWrapper(upload, encoding='utf-8', newline=''), file_type)
+            except (UnicodeDecodeError, ValueError):
+                return Response({"error": "Cannot read users from the file"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = request.data.get('users') if isinstance(request.data, dict) else request.data
+            if not isinstance(rows, list):
+                return Response({"error": "users should be a list"}, status=status.HTTP_400_BAD_REQUEST)
+
+        created, rejected = provision_users(rows)
+        return Response({"created": created, "rejected": rejected}, status=status.HTTP_201_CREATED)
+
     # PUT /api/v1/user/login/
     @action(detail=False, methods=['PUT'])
     def login(self, request):
-        print("DEBUG: UserViewSet.login()")
         username = request.data.get('username')
         password = request.data.get('password')
 
@@ -48,6 +79,7 @@ class UserViewSet(viewsets.GenericViewSet):
         if user:
             login(request, user)
 
+            user = self.get_queryset().get(pk=user.pk)
             data = self.get_serializer(user).data
             token, created = Token.objects.get_or_create(user=user)
             data['token'] = token.key
@@ -58,24 +90,22 @@ class UserViewSet(viewsets.GenericViewSet):
     # POST /api/v1/user/logout/
     @action(detail=False, methods=['POST'])
     def logout(self, request):
-        print("DEBUG: UserViewSet.logout()")
+        invalidate_user_auth(request.user.pk)
         logout(request)
         return Response()
 
     # GET /api/v1/user/me/
     def retrieve(self, request, pk=None):
-        print("DEBUG: UserViewSet.retrieve()")
         # get_object()의 기본 filter는 pk=pk?? YES
-        user = request.user if pk == 'me' else self.get_object()
+        user = self.get_queryset().get(pk=request.user.pk) if pk == 'me' else self.get_object()
         return Response(self.get_serializer(user).data)
 
     # PUT /api/v1/user/me/
     def update(self, request, pk=None):
-        print("DEBUG: UserViewSet.update()")
         if pk != 'me':
             return Response({"error": "Can't update other Users information"}, status=status.HTTP_403_FORBIDDEN)
 
-        user = request.user
+        user = self.get_queryset().get(pk=request.user.pk)
         data = request.data.copy()
         data.pop('accepted', None)
 
@@ -88,7 +118,6 @@ class UserViewSet(viewsets.GenericViewSet):
     # POST /api/v1/user/participant/
     @action(detail=False, methods=['POST'])
     def participant(self, request):
-        print("DEBUG: UserViewSet.participant()")
         user = request.user
         data = request.data.copy()
 
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class WaffleBackendConfig(AppConfig):
+    name = 'waffle_backend'
+
+    def ready(self):
+        import waffle_backend.checks  # noqa: F401
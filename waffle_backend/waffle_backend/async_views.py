@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+
+from waffle_backend.metrics import collect_metrics
+
+
+class DBPoolFull(Exception):
+    pass
+
+
+class DBThreadPool:
+    # ASGI에서 DB 접근을 제한된 수의 thread로 (thread 수 = 동시에 열리는 DB connection 수)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.ASYNC_DB_WORKERS, thread_name_prefix='async-db'
+                )
+            return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        with self._lock:
+            # 실행 중 + 대기 중인 작업이 너무 많으면 queue에 쌓지 않고 바로 거절
+            if self._pending >= settings.ASYNC_DB_WORKERS + settings.ASYNC_DB_MAX_PENDING:
+                raise DBPoolFull
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+db_pool = DBThreadPool()
+
+
+def _call_view(sync_view, request, *args, **kwargs):
+    # pool thread에서 request_started/finished 대신 connection 정리, query는 request.metrics에 기록
+    close_old_connections()
+    try:
+        metrics = getattr(request, 'metrics', None)
+        with collect_metrics(metrics) if metrics is not None else nullcontext():
+            response = sync_view(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(viewset_class, actions):
+    # 기존 viewset action(인증, 권한, ETag, pagination 포함)을 그대로 pool thread에서 실행하는 async view
+    sync_view = viewset_class.as_view(actions)
+
+    async def view(request, *args, **kwargs):
+        try:
+            return await db_pool.run(_call_view, sync_view, request, *args, **kwargs)
+        except DBPoolFull:
+            return JsonResponse({"error": "Server is busy, please retry"}, status=503)
+
+    view.csrf_exempt = True
+    return view
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# process마다 따로인 cache backend
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    # seminar response/ETag version, token 인증 version, "seminar full" 표시, replica stickiness가 cache에 있으므로
+    # worker process가 여럿이면 모든 process가 같은 cache를 봐야 함
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [Error(
+            f'The default cache backend {backend} is not shared between processes.',
+            hint='Set CACHE_BACKEND/CACHE_LOCATION to a shared cache such as memcached '
+                 '(e.g. django.core.cache.backends.memcached.PyLibMCCache and 127.0.0.1:11211).',
+            id='waffle_backend.E001',
+        )]
+    return []
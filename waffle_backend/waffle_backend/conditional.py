@@ -0,0 +1,28 @@
+import hashlib
+
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from waffle_backend.db.routers import read_from
+
+
+class ConditionalGetMixin:
+    # validators(max(updated_at), count 등)가 같으면 serialize하지 않고 304
+
+    def conditional_response(self, request, get_response, validators, last_modified=None):
+        etag = quote_etag(hashlib.md5(repr((request.get_full_path(), validators)).encode('utf-8')).hexdigest())
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            # validators(cache의 version)는 primary의 쓰기로 바뀌므로 body도 primary에서
+            # -> lag이 있는 replica의 이전 data가 새 ETag로 304에 고정되지 않도록
+            with read_from(DEFAULT_DB_ALIAS):
+                response = get_response()
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
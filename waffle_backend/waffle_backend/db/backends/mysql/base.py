@@ -0,0 +1,13 @@
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from waffle_backend.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, MySQLDatabaseWrapper):
+
+    def ping(self, connection):
+        try:
+            connection.ping()
+        except self.Database.Error:
+            return False
+        return True
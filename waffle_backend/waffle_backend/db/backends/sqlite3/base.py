@@ -0,0 +1,12 @@
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from waffle_backend.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+
+    def _get_pool(self):
+        # in-memory db는 close하면 사라지므로 원래대로 connection을 유지
+        if self.is_in_memory_db():
+            return None
+        return super(DatabaseWrapper, self)._get_pool()
@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+
+from waffle_backend.metrics import record_timing, registry
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    # DB-API connection pool (thread-safe), DatabaseWrapper.connect()/close()가 checkout/release
+
+    def __init__(self, size, max_lifetime=None, health_check_interval=0, timeout=10):
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._idle = deque()  # (connection, released_at)
+        self._created_at = {}  # checkout 중인 것과 idle인 것 모두
+        self._closed = False
+
+    def stats(self):
+        with self._condition:
+            return {'size': len(self._created_at), 'idle': len(self._idle)}
+
+    def _expired(self, connection, now):
+        return self.max_lifetime is not None and now - self._created_at[connection] >= self.max_lifetime
+
+    def _discard(self, connection):
+        # lock 안에서 호출, 실제 close는 호출한 쪽에서
+        del self._created_at[connection]
+        registry.incr('db_pool.discarded')
+        self._condition.notify()
+
+    def checkout(self, connect, ping):
+        start = time.perf_counter()
+        try:
+            return self._checkout(connect, ping, time.monotonic() + self.timeout)
+        finally:
+            registry.incr('db_pool.checkout')
+            record_timing('db_connect', time.perf_counter() - start)
+
+    def _checkout(self, connect, ping, deadline):
+        while True:
+            with self._condition:
+                while not self._idle and len(self._created_at) >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        registry.incr('db_pool.timeout')
+                        raise PoolTimeout(f'No connection available in the pool within {self.timeout}s')
+                    self._condition.wait(remaining)
+
+                if not self._idle:
+                    # 새 connection 자리를 미리 잡아 둠
+                    placeholder = object()
+                    self._created_at[placeholder] = time.monotonic()
+                    break
+
+                # 최근에 반납된 것부터 (오래 쉰 connection은 server에서 끊겼을 가능성이 큼)
+                connection, released_at = self._idle.pop()
+                now = time.monotonic()
+                if self._expired(connection, now):
+                    self._discard(connection)
+                    _close_quietly(connection)
+                    continue
+                needs_check = now - released_at >= self.health_check_interval
+
+            if not needs_check or ping(connection):
+                registry.incr('db_pool.reused')
+                return connection
+
+            with self._condition:
+                self._discard(connection)
+            _close_quietly(connection)
+
+        try:
+            connection = connect()
+        except Exception:
+            with self._condition:
+                del self._created_at[placeholder]
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created_at[connection] = self._created_at.pop(placeholder)
+        registry.incr('db_pool.created')
+        return connection
+
+    def release(self, connection, reusable=True):
+        with self._condition:
+            if connection not in self._created_at:
+                # pool 밖에서 만들어졌거나 이미 버려진 connection
+                reusable = False
+            elif self._closed or not reusable or self._expired(connection, time.monotonic()):
+                self._discard(connection)
+                reusable = False
+            else:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+        if not reusable:
+            _close_quietly(connection)
+
+    def discard(self, connection):
+        self.release(connection, reusable=False)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            for connection in idle:
+                self._discard(connection)
+        for connection in idle:
+            _close_quietly(connection)
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, options):
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                size=options['SIZE'],
+                max_lifetime=options.get('MAX_LIFETIME'),
+                health_check_interval=options.get('HEALTH_CHECK_INTERVAL', 0),
+                timeout=options.get('TIMEOUT', 10),
+            )
+        return _pools[key]
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+class PooledDatabaseWrapperMixin:
+    # settings.DATABASES[alias]['POOL'] = {'SIZE': ..., 'MAX_LIFETIME': ..., 'HEALTH_CHECK_INTERVAL': ..., 'TIMEOUT': ...}
+    # SIZE가 0이거나 없으면 원래 backend와 동일하게 동작
+
+    def _get_pool(self):
+        options = self.settings_dict.get('POOL') or {}
+        if not options.get('SIZE'):
+            return None
+        key = (
+            self.alias,
+            self.settings_dict['NAME'],
+            self.settings_dict['HOST'],
+            self.settings_dict['PORT'],
+            self.settings_dict['USER'],
+        )
+        return get_pool(key, options)
+
+    def ping(self, connection):
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except self.Database.Error:
+            return False
+        return True
+
+    def get_new_connection(self, conn_params):
+        pool = self._get_pool()
+        if pool is None:
+            return super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params)
+
+        try:
+            return pool.checkout(
+                lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params),
+                self.ping,
+            )
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e))
+
+    def _close(self):
+        pool = self._get_pool()
+        if pool is None or self.connection is None:
+            return super(PooledDatabaseWrapperMixin, self)._close()
+
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # close() 뒤에도 이 wrapper가 connection을 들고 있으므로 재사용하지 않음
+                pool.discard(self.connection)
+                return
+            reusable = True
+            if not self.get_autocommit():
+                try:
+                    self.connection.rollback()
+                except self.Database.Error:
+                    reusable = False
+            if self.errors_occurred:
+                # IntegrityError 등은 connection 문제가 아니므로 실제로 끊겼는지 확인
+                reusable = reusable and self.is_usable()
+            pool.release(self.connection, reusable=reusable)
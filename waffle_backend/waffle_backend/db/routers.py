@@ -0,0 +1,90 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_KEY = 'db:sticky:{}'
+
+_read_database = ContextVar('read_database', default=None)
+
+
+@contextmanager
+def read_from(alias):
+    token = _read_database.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_database.reset(token)
+
+
+def get_read_database():
+    return _read_database.get()
+
+
+def mark_sticky(user):
+    # 방금 쓴 user는 replica lag 동안 primary에서 읽음 (read-your-writes)
+    cache.set(STICKY_KEY.format(user.pk), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def select_read_database(user):
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and cache.get(STICKY_KEY.format(user.pk)):
+        return DEFAULT_DB_ALIAS
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    # ReplicaReadMixin(read_from)으로 지정된 request의 read만 replica로, 나머지는 모두 default
+
+    def db_for_read(self, model, **hints):
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):
+        # replica에서 읽은 instance의 save()도 default로
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    # replica_actions의 GET은 replica에서, 쓰기에 성공한 user는 잠시 primary에 고정
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super(ReplicaReadMixin, self).initial(request, *args, **kwargs)
+        self._read_database_token = None
+        if request.method in SAFE_METHODS and self.action in self.replica_actions:
+            alias = select_read_database(request.user)
+            if alias:
+                self._read_database_token = _read_database.set(alias)
+
+    def _reset_read_database(self):
+        token = getattr(self, '_read_database_token', None)
+        if token is not None:
+            _read_database.reset(token)
+            self._read_database_token = None
+        return token is not None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super(ReplicaReadMixin, self).dispatch(request, *args, **kwargs)
+        finally:
+            # APIException이 아닌 예외로 finalize_response를 거치지 않은 경우에도 thread에 replica가 남지 않도록
+            self._reset_read_database()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if not self._reset_read_database() and request.method not in SAFE_METHODS \
+                and response.status_code < 400 and request.user.is_authenticated:
+            mark_sticky(request.user)
+        return super(ReplicaReadMixin, self).finalize_response(request, response, *args, **kwargs)
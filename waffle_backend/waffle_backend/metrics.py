@@ -0,0 +1,211 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# upper bounds (ms) of the latency histogram buckets, the last bucket is +Inf
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+TIMINGS = ('db_connect', 'db', 'serialize', 'total')
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.query_count = 0
+        self.timings = dict.fromkeys(TIMINGS, 0.0)
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper: 실행된 query 수와 DB 시간
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings['db'] += time.perf_counter() - start
+            self.query_count += 1
+
+    def server_timing(self):
+        return ', '.join(
+            f'{name};dur={seconds * 1000:.2f}' + (f';desc="{self.query_count} queries"' if name == 'db' else '')
+            for name, seconds in self.timings.items()
+        )
+
+
+class EndpointMetrics:
+
+    def __init__(self):
+        self.count = 0
+        self.query_count = 0
+        self.max_query_count = 0
+        self.timings = dict.fromkeys(TIMINGS, 0.0)
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, request_metrics):
+        self.count += 1
+        self.query_count += request_metrics.query_count
+        self.max_query_count = max(self.max_query_count, request_metrics.query_count)
+        for name, seconds in request_metrics.timings.items():
+            self.timings[name] += seconds
+
+        total_ms = request_metrics.timings['total'] * 1000
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS) if total_ms <= bound), len(LATENCY_BUCKETS))
+        self.latency_buckets[index] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'queries': {'mean': self.query_count / self.count, 'max': self.max_query_count},
+            **{f'{name}_ms': {'mean': seconds * 1000 / self.count} for name, seconds in self.timings.items()},
+            'latency_ms': {
+                **{f'le_{bound}': count for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)},
+                'le_inf': self.latency_buckets[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._counters = Counter()
+
+    def add(self, endpoint, request_metrics):
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointMetrics()).add(request_metrics)
+
+    def incr(self, counter, value=1):
+        # cache hit/miss 등 endpoint와 무관한 counter
+        with self._lock:
+            self._counters[counter] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'endpoints': {endpoint: metrics.to_dict() for endpoint, metrics in sorted(self._endpoints.items())},
+                'counters': dict(sorted(self._counters.items())),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._counters.clear()
+
+
+registry = MetricsRegistry()
+
+
+def percentile(sorted_values, percent):
+    # nearest-rank, bench command들의 p50/p95/p99 출력용
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@contextmanager
+def collect_metrics(metrics):
+    # 이 thread에서 실행되는 query와 record_timing()을 metrics에 기록
+    token = _current_metrics.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+def record_timing(name, seconds):
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.timings[name] += seconds
+
+
+@contextmanager
+def timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # ASGI: async view를 sync middleware 때문에 thread로 넘기지 않도록
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        request.metrics = metrics = RequestMetrics()
+        start = time.perf_counter()
+        with collect_metrics(metrics):
+            response = self.get_response(request)
+        return self._finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        # query는 실행되는 thread에서 기록 (waffle_backend.async_views)
+        request.metrics = metrics = RequestMetrics()
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        return self._finish(request, response, metrics, start)
+
+    def _finish(self, request, response, metrics, start):
+        metrics.timings['total'] = time.perf_counter() - start
+
+        response['Server-Timing'] = metrics.server_timing()
+        resolver_match = request.resolver_match
+        if resolver_match:
+            registry.add(f'{request.method} {resolver_match.view_name}', metrics)
+        return response
+
+
+class TimedSerializerMixin:
+
+    def to_representation(self, instance):
+        metrics = getattr(self.context.get('request'), 'metrics', None)
+        if metrics is None:
+            return super(TimedSerializerMixin, self).to_representation(instance)
+
+        start = time.perf_counter()
+        try:
+            return super(TimedSerializerMixin, self).to_representation(instance)
+        finally:
+            metrics.timings['serialize'] += time.perf_counter() - start
+
+
+@lru_cache(maxsize=None)
+def timed_serializer_class(serializer_class):
+    return type(serializer_class.__name__, (TimedSerializerMixin, serializer_class), {})
+
+
+class MetricsViewMixin:
+    # serializer의 to_representation 시간을 request.metrics에 기록
+
+    def get_serializer_class(self):
+        return timed_serializer_class(super(MetricsViewMixin, self).get_serializer_class())
+
+
+class MetricsView(APIView):
+    permission_classes = (IsAdminUser, )
+
+    # GET /api/v1/_metrics
+    def get(self, request):
+        return Response(registry.snapshot())
@@ -0,0 +1,61 @@
+import math
+import re
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # stdlib json (JSONRenderer) 그대로 사용
+    orjson = None
+
+# orjson은 1e16, json은 1e+16 -> 지수 표기 float가 있을 수 있으면 stdlib json으로 (string 안의 '1e5' 등도 포함)
+# 'e'로 시작하는 pattern이 훨씬 빠르므로 앞의 숫자는 따로 확인
+_EXPONENT = re.compile(rb'e-?[0-9]')
+_DIGITS = b'0123456789'
+
+
+def _has_exponent(ret):
+    for match in _EXPONENT.finditer(ret):
+        start = match.start()
+        if start and ret[start - 1] in _DIGITS:
+            return True
+    return False
+
+
+# orjson은 NaN/Infinity를 null로, json(strict)은 ValueError -> 'null'이 있을 때만 data를 확인
+def _has_non_finite(data):
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple, set, frozenset)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    # JSONRenderer와 byte 단위로 같은 결과를 orjson으로 (indent, non-compact 등 지원하지 않는 경우 fallback)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact or not self.strict:
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+
+        try:
+            # datetime 등은 DRF encoder의 형식(+00:00 -> Z)으로
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except (orjson.JSONEncodeError, TypeError, ValueError):
+            # 64bit를 넘는 int 등
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+        if _has_exponent(ret) or (b'null' in ret and _has_non_finite(data)):
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
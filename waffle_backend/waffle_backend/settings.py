@@ -44,9 +44,11 @@ INSTALLED_APPS = [
     'survey.apps.SurveyConfig',
     'user.apps.UserConfig',
     'seminar.apps.SeminarConfig',
+    'waffle_backend.apps.WaffleBackendConfig',
 ]
 
 MIDDLEWARE = [
+    'waffle_backend.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,10 +60,26 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
-    )
+        'user.authentication.CachedTokenAuthentication',
+    ),
+    # JSONRenderer와 같은 bytes를 orjson으로 (orjson이 없으면 stdlib json)
+    'DEFAULT_RENDERER_CLASSES': (
+        'waffle_backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# process-local token -> user cache of CachedTokenAuthentication
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+TOKEN_CACHE_TIMEOUT = int(os.getenv('TOKEN_CACHE_TIMEOUT', 300))
+
+# default / upper bound of ?page_size= on cursor-paginated list endpoints
+PAGE_SIZE = int(os.getenv('PAGE_SIZE', 20))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+
+# minimum ratio of query n-grams a seminar name should contain to match ?search=
+SEMINAR_SEARCH_MIN_MATCH = float(os.getenv('SEMINAR_SEARCH_MIN_MATCH', 0.75))
+
 if DEBUG_TOOLBAR:
     INSTALLED_APPS.append('debug_toolbar')
     MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
@@ -93,18 +111,87 @@ WSGI_APPLICATION = 'waffle_backend.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        # django.db.backends.mysql + connection pool (waffle_backend.db.pool)
+        'ENGINE': 'waffle_backend.db.backends.mysql',
         'HOST': 'localhost',
         'PORT': 3306,
         'NAME': 'waffle_backend_assignment_2',
         'USER': 'waffle-backend',
         'PASSWORD': 'seminar',
+        # seconds Django keeps a connection per thread (0: hand it back to the pool after every request)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+        'POOL': {
+            # 0 disables pooling
+            'SIZE': int(os.getenv('DB_POOL_SIZE', 10)),
+            # keep below MySQL wait_timeout
+            'MAX_LIFETIME': int(os.getenv('DB_POOL_MAX_LIFETIME', 60 * 60)),
+            # ping connections that have been idle for at least this many seconds before reuse
+            'HEALTH_CHECK_INTERVAL': int(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30)),
+            # seconds to wait for a free connection before raising OperationalError
+            'TIMEOUT': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        },
         'TEST': {
             'NAME': 'waffle_backend_assignment_2_test',
         }
     }
 }
 
+# read replicas of 'default', e.g. DB_REPLICA_HOSTS=replica1:3306,replica2:3306
+DATABASE_REPLICAS = []
+for index, replica_host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+    host, _, port = replica_host.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': int(port) if port else DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['waffle_backend.db.routers.ReplicaRouter']
+
+# seconds a user keeps reading from 'default' after a successful write (read-your-writes)
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+# versions and marks shared by every worker process live here, so deployments with more than one process need a
+# shared backend (memcached), `manage.py check --deploy` fails on a process-local one (waffle_backend/checks.py)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', 'waffle-backend'),
+    }
+}
+if 'memcached' not in CACHE_BACKEND:
+    # memcached는 자체 memory 한도로 evict, 나머지 backend는 기본 300개 대신
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 10000))}
+
+# seconds a versioned OperatingSystem catalog stays in the shared cache
+OS_CATALOG_TIMEOUT = int(os.getenv('OS_CATALOG_TIMEOUT', 60 * 60 * 24))
+# seconds a process reuses its local OS catalog before checking the shared version again
+OS_CATALOG_LOCAL_TIMEOUT = int(os.getenv('OS_CATALOG_LOCAL_TIMEOUT', 5))
+
+# seconds a versioned GET /api/v1/seminar/{id}/ response stays in the cache
+SEMINAR_CACHE_TIMEOUT = int(os.getenv('SEMINAR_CACHE_TIMEOUT', 60 * 60))
+
+# token buckets of POST /api/v1/seminar/{id}/user/ per user and per seminar: burst size and refill rate
+# (requests per second), a burst of 0 disables the throttle
+SEMINAR_JOIN_USER_BURST = int(os.getenv('SEMINAR_JOIN_USER_BURST', 5))
+SEMINAR_JOIN_USER_RATE = float(os.getenv('SEMINAR_JOIN_USER_RATE', 1))
+SEMINAR_JOIN_SEMINAR_BURST = int(os.getenv('SEMINAR_JOIN_SEMINAR_BURST', 200))
+SEMINAR_JOIN_SEMINAR_RATE = float(os.getenv('SEMINAR_JOIN_SEMINAR_RATE', 100))
+
+# seconds a "seminar full" mark short-circuits joins, it is dropped earlier by any change of the seminar
+SEMINAR_FULL_CACHE_TIMEOUT = int(os.getenv('SEMINAR_FULL_CACHE_TIMEOUT', 60))
+
+# /api/v1/async/... read endpoints: DB worker threads and how many requests may wait for one before 503
+ASYNC_DB_WORKERS = int(os.getenv('ASYNC_DB_WORKERS', 8))
+ASYNC_DB_MAX_PENDING = int(os.getenv('ASYNC_DB_MAX_PENDING', 256))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -124,6 +211,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# pbkdf2_sha256 with PASSWORD_HASH_ITERATIONS, existing hashes are rehashed on the next login
+PASSWORD_HASHERS = [
+    'user.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# PBKDF2 iterations per environment (Django 3.1 default: 216000, lower only for dev/test)
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 216000))
+# bounded thread pool that computes PBKDF2 off the request thread (0: hash inline)
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/3.1/topics/i18n/
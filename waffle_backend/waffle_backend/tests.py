@@ -0,0 +1,193 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from waffle_backend.checks import check_shared_cache
+from waffle_backend.db.pool import ConnectionPool, PoolTimeout
+from waffle_backend.metrics import RequestMetrics, collect_metrics, percentile, registry
+from waffle_backend.renderers import FastJSONRenderer
+
+
+def _ping(connection):
+    try:
+        connection.execute('SELECT 1')
+    except sqlite3.Error:
+        return False
+    return True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.created = []
+
+    def _connect(self):
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self.created.append(connection)
+        return connection
+
+    def test_checkout_reuses_released_connection(self):
+        pool = ConnectionPool(size=2)
+        connection = pool.checkout(self._connect, _ping)
+        pool.release(connection)
+        self.assertIs(pool.checkout(self._connect, _ping), connection)
+        self.assertEqual(len(self.created), 1)
+
+        other = pool.checkout(self._connect, _ping)
+        self.assertIsNot(other, connection)
+        self.assertEqual(pool.stats(), {'size': 2, 'idle': 0})
+
+    def test_checkout_waits_for_release(self):
+        pool = ConnectionPool(size=1, timeout=0.05)
+        connection = pool.checkout(self._connect, _ping)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(self._connect, _ping)
+
+        pool.timeout = 5
+        timer = threading.Timer(0.05, pool.release, (connection, ))
+        timer.start()
+        self.assertIs(pool.checkout(self._connect, _ping), connection)
+        timer.join()
+
+    def test_checkout_discards_broken_and_expired_connections(self):
+        pool = ConnectionPool(size=1, health_check_interval=0)
+        connection = pool.checkout(self._connect, _ping)
+        pool.release(connection)
+        connection.close()
+        new_connection = pool.checkout(self._connect, _ping)
+        self.assertIsNot(new_connection, connection)
+
+        pool.max_lifetime = 0
+        pool.release(new_connection)
+        self.assertEqual(pool.stats(), {'size': 0, 'idle': 0})
+        self.assertEqual(len(self.created), 2)
+
+        pool.release(self._connect(), reusable=True)
+        self.assertEqual(pool.stats(), {'size': 0, 'idle': 0})
+
+
+class PooledSQLiteBackendTestCase(SimpleTestCase):
+
+    def setUp(self):
+        fd, name = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        self.addCleanup(os.remove, name)
+        self.connections = ConnectionHandler({
+            'default': {
+                'ENGINE': 'waffle_backend.db.backends.sqlite3',
+                'NAME': name,
+                'POOL': {'SIZE': 1, 'TIMEOUT': 0},
+            },
+        })
+        self.connection = self.connections['default']
+        self.addCleanup(self.connections.close_all)
+        self.addCleanup(lambda: self.connection._get_pool().close())
+
+    def test_close_returns_connection_to_pool(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+        metrics = RequestMetrics()
+        with collect_metrics(metrics):
+            self.connection.ensure_connection()
+            raw_connection = self.connection.connection
+            self.connection.close()
+            self.connection.ensure_connection()
+        self.assertIs(self.connection.connection, raw_connection)
+        self.assertGreater(metrics.timings['db_connect'], 0)
+        counters = registry.snapshot()['counters']
+        self.assertEqual((counters['db_pool.created'], counters['db_pool.reused']), (1, 1))
+
+        with self.connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            self.assertEqual(cursor.fetchone(), (1, ))
+
+        # SIZE 1: 다른 wrapper는 반납 전까지 connection을 얻지 못함
+        other = ConnectionHandler(self.connections.databases)['default']
+        with self.assertRaises(OperationalError):
+            other.ensure_connection()
+        self.connection.close()
+        other.ensure_connection()
+        self.assertIs(other.connection, raw_connection)
+        other.close()
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+
+    def assertSameBytes(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_render_same_bytes_as_json_renderer(self):
+        now = timezone.now()
+        for data in (
+            None,
+            [],
+            {'name': '와플 "세미나"\n\t\\/', 'line': 'a\u2028b\u2029c', 'control': '\x00\x1f', 'emoji': '🧇'},
+            OrderedDict([('b', 1), ('a', [True, False, None, -1, 2 ** 63 - 1])]),
+            {'big': 2 ** 70, 'floats': [0.1, 1.5, -0.0, 3.0, 123456789.123]},
+            {'exponent': [1e16, 1e-07, 1e22]},
+            {1: 'int key', None: 'null key'},
+            {
+                'utc': now,
+                'seoul': now.astimezone(datetime.timezone(datetime.timedelta(hours=9))),
+                'naive': datetime.datetime(2020, 8, 25, 22, 4, 25, 123456),
+                'date': datetime.date(2020, 8, 25),
+                'time': datetime.time(14, 0),
+                'decimal': Decimal('1.10'),
+                'uuid': uuid.UUID(int=1),
+                'lazy': gettext_lazy('lazy'),
+                'set': {1},
+            },
+        ):
+            self.assertSameBytes(data)
+
+        self.assertSameBytes({'a': [1, {'b': None}]}, 'application/json; indent=4')
+
+    def test_render_non_finite_float_raises_like_json_renderer(self):
+        for data in (
+            {'mean': float('nan'), 'name': None},
+            [None, {'max': float('inf')}],
+            {'min': [float('-inf')], 'set': {None}},
+            {'decimal': Decimal('NaN'), 'null': None},
+        ):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render(data)
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+
+    def test_check_shared_cache(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ['waffle_backend.E001'])
+
+        memcached = {'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyLibMCCache', 'LOCATION': '127.0.0.1:11211'
+        }}
+        with self.settings(CACHES=memcached):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class PercentileTestCase(SimpleTestCase):
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([0.3], 99), 0.3)
+        self.assertEqual(percentile([], 50), 0.0)
@@ -18,11 +18,14 @@ from django.conf.urls import url
 from django.contrib import admin
 from django.urls import include, path
 
+from waffle_backend.metrics import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('survey.urls')),
     path('api/v1/', include('user.urls')),
     path('api/v1/', include('seminar.urls')),
+    path('api/v1/_metrics', MetricsView.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG_TOOLBAR: